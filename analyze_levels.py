@@ -0,0 +1,183 @@
+"""Analyze every level in a levels file without starting the game.
+
+    python analyze_levels.py levels.json --format csv --output report.csv
+
+Levels are loaded through LevelManager and analyzed in a process pool, one
+report row per level.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from level_manager import LevelManager
+from maze_utils import AStar
+from reachability import ReachabilityMap
+
+FIELDS = [
+    "level_number", "title", "solvable", "open_cells", "reachable_cells",
+    "coins", "stars", "diamonds", "unreachable_pickups", "route_length",
+    "enemies", "nearest_enemy_distance", "dead_end_ratio", "weighted_terrain",
+    "difficulty",
+]
+
+
+def collection_route(maze, start, pickups):
+    """Greedy nearest-neighbour route length from start through every pickup.
+
+    Each leg is a breadth-first search that stops at the first pickup still
+    to collect. Coins fill every empty cell, so most legs end a step or two
+    away and this is far cheaper than a full distance table.
+    """
+    astar = AStar(maze)
+    neighbors = {}
+    remaining = set(pickups)
+    remaining.discard(start)
+
+    length = 0
+    current = start
+    while remaining:
+        distances = {current: 0}
+        frontier = deque([current])
+        while frontier:
+            cell = frontier.popleft()
+            if cell in remaining:
+                break
+            if cell not in neighbors:
+                neighbors[cell] = astar.get_neighbors(cell)
+            for next in neighbors[cell]:
+                if next not in distances:
+                    distances[next] = distances[cell] + 1
+                    frontier.append(next)
+        else:
+            return None
+        length += distances[cell]
+        remaining.remove(cell)
+        current = cell
+    return length
+
+
+def dead_end_ratio(maze):
+    """Share of open cells with exactly one open neighbour"""
+    height, width = len(maze), len(maze[0])
+    open_cells = dead_ends = 0
+    for y, row in enumerate(maze):
+        for x, cell in enumerate(row):
+            if cell == 'X':
+                continue
+            open_cells += 1
+            exits = sum(1 for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+                        if 0 <= nx < width and 0 <= ny < height and maze[ny][nx] != 'X')
+            if exits == 1:
+                dead_ends += 1
+    return dead_ends / open_cells if open_cells else 0.0
+
+
+def difficulty_score(route_length, open_cells, dead_ends, enemy_distances):
+    """0-10 blend of route length, dead ends and how close enemies spawn.
+
+    Route length counts for 40% (saturating at four passes over the open
+    cells), the dead-end ratio for 30%, and enemy threat for 30%, where
+    each enemy adds more the nearer it starts to the player.
+    """
+    route = min(1.0, route_length / (4 * open_cells)) if open_cells else 0.0
+    threat = min(1.0, sum(1 / (1 + distance / 5) for distance in enemy_distances))
+    return round(10 * (0.4 * route + 0.3 * dead_ends + 0.3 * threat), 2)
+
+
+def analyze_level(level_data):
+    """Report for one level, given as (level_number, title, maze, weighted_terrain)"""
+    level_number, title, maze, weighted_terrain = level_data
+    reachability = ReachabilityMap(maze)
+    summary = reachability.summary()
+    counts = {symbol: sum(row.count(symbol) for row in maze) for symbol in (' ', '*', 'D')}
+    start = reachability.start
+    solvable = start is not None and not summary["unreachable_pickups"]
+
+    route_length = None
+    if solvable:
+        pickups = [(x, y) for y, row in enumerate(maze)
+                   for x, cell in enumerate(row) if cell in ReachabilityMap.PICKUPS]
+        route_length = collection_route(maze, start, pickups)
+
+    # Enemies that cannot reach the start are no threat and are left out
+    enemy_distances = [d for d in summary["enemy_distances"] if d is not None]
+    dead_ends = dead_end_ratio(maze)
+    return {
+        "level_number": level_number,
+        "title": title,
+        "solvable": solvable,
+        "open_cells": summary["open_cells"],
+        "reachable_cells": summary["reachable_cells"],
+        "coins": counts[' '],
+        "stars": counts['*'],
+        "diamonds": counts['D'],
+        "unreachable_pickups": len(summary["unreachable_pickups"]),
+        "route_length": route_length,
+        "enemies": len(summary["enemy_distances"]),
+        "nearest_enemy_distance": min(enemy_distances) if enemy_distances else None,
+        "dead_end_ratio": round(dead_ends, 3),
+        "weighted_terrain": weighted_terrain,
+        "difficulty": difficulty_score(route_length or 0, summary["open_cells"], dead_ends, enemy_distances)
+        if solvable else None,
+    }
+
+
+def load_levels(levels_file):
+    level_manager = LevelManager(levels_file)
+    # LevelManager reports progress on stdout, which may be carrying the report
+    with contextlib.redirect_stdout(sys.stderr):
+        level_manager.load_levels_from_file()
+    return [(level.level_number, level.title, level.maze, level.has_weighted_terrain())
+            for level in level_manager.levels]
+
+
+def analyze_levels(levels, workers=None):
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(levels) < 2:
+        return [analyze_level(level) for level in levels]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # A few chunks per worker keeps them busy without a round trip per level
+        chunksize = max(1, len(levels) // (4 * workers))
+        return list(executor.map(analyze_level, levels, chunksize=chunksize))
+
+
+def write_report(reports, output, report_format):
+    if report_format == "json":
+        json.dump(reports, output, indent=2)
+        output.write("\n")
+    else:
+        writer = csv.DictWriter(output, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(reports)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze the levels in a levels file")
+    parser.add_argument("levels_file", nargs="?", default="levels.json")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.levels_file):
+        parser.error(f"levels file {args.levels_file} not found")
+    reports = analyze_levels(load_levels(args.levels_file), args.workers)
+
+    if args.output:
+        with open(args.output, "w", newline="") as output:
+            write_report(reports, output, args.format)
+    else:
+        write_report(reports, sys.stdout, args.format)
+    unsolvable = [report["level_number"] for report in reports if not report["solvable"]]
+    if unsolvable:
+        print(f"Unsolvable levels: {', '.join(map(str, unsolvable))}", file=sys.stderr)
+    return 1 if unsolvable else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+import random
+import zlib
+from collections import OrderedDict
+
+from constants import CHUNK_SIZE, CHUNK_MAX_RESIDENT
+
+
+class GridRow:
+    """One row of a ChunkedGrid; indexes and slices like the row lists of small levels"""
+    def __init__(self, grid, y):
+        self.grid = grid
+        self.y = y
+
+    def __len__(self):
+        return self.grid.width
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            start, stop, step = x.indices(self.grid.width)
+            if step == 1:
+                return list(self.grid.read_span(start, self.y, stop))
+            return list(self.grid.row_string(self.y)[x])
+        if x < 0:
+            x += self.grid.width
+        return self.grid.get(x, self.y)
+
+    def __setitem__(self, x, value):
+        if isinstance(x, slice):
+            start, stop, step = x.indices(self.grid.width)
+            value = list(value)
+            if step != 1 or len(value) != stop - start:
+                raise ValueError("grid rows only take same-length contiguous slices")
+            self.grid.write_span(start, self.y, ''.join(value))
+            return
+        if x < 0:
+            x += self.grid.width
+        self.grid.set(x, self.y, value)
+
+    def __iter__(self):
+        return iter(self.grid.row_string(self.y))
+
+    def count(self, symbol):
+        return self.grid.row_string(self.y).count(symbol)
+
+
+class ChunkedGrid:
+    """A grid of one-character cells kept as fixed-size compressed chunks.
+
+    Only the chunks that are read or written get decoded, and at most
+    `max_resident` of them stay decoded; the least recently used one is
+    re-compressed when another is needed. Chunks made entirely of `fill`
+    take no storage at all. grid[y][x] reads and writes through GridRow,
+    so code written for nested lists keeps working.
+    """
+    def __init__(self, width, height, fill, chunk_size=CHUNK_SIZE, max_resident=CHUNK_MAX_RESIDENT):
+        self.width = width
+        self.height = height
+        self.fill = fill
+        self.fill_byte = ord(fill)
+        self.chunk_size = chunk_size
+        self.max_resident = max_resident
+        self.encoded = {}
+        self.resident = OrderedDict()
+        self.dirty = set()
+
+    @classmethod
+    def from_rows(cls, rows, fill, **kwargs):
+        """Encode a list of row strings or lists, one band of chunks at a time"""
+        rows = [row if isinstance(row, str) else ''.join(row) for row in rows]
+        grid = cls(len(rows[0]), len(rows), fill, **kwargs)
+        size = grid.chunk_size
+        for cy in range(0, grid.height, size):
+            band = [row.encode('latin-1') for row in rows[cy:cy + size]]
+            for cx in range(0, grid.width, size):
+                grid.store((cx // size, cy // size), [row[cx:cx + size] for row in band])
+        return grid
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.height
+        return GridRow(self, y)
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield GridRow(self, y)
+
+    def __getstate__(self):
+        # Pickle everything compressed, so worker processes get a compact copy
+        self.flush()
+        state = self.__dict__.copy()
+        state['resident'] = OrderedDict()
+        state['dirty'] = set()
+        return state
+
+    def snapshot(self):
+        """Read-only copy for another thread, sharing the compressed chunks but not the decoded ones"""
+        self.flush()
+        copy = ChunkedGrid(self.width, self.height, self.fill, self.chunk_size, self.max_resident)
+        copy.encoded = dict(self.encoded)
+        return copy
+
+    def chunk_shape(self, key):
+        """Width and height of a chunk; the last row and column of chunks may be short"""
+        size = self.chunk_size
+        return (min(size, self.width - key[0] * size), min(size, self.height - key[1] * size))
+
+    def store(self, key, rows):
+        chunk_width, chunk_height = self.chunk_shape(key)
+        data = b''.join(row.ljust(chunk_width, bytes((self.fill_byte,))) for row in rows)
+        if data.count(self.fill_byte) == chunk_width * chunk_height:
+            self.encoded.pop(key, None)
+        else:
+            self.encoded[key] = zlib.compress(data)
+
+    def decode(self, key):
+        """Chunk contents as a bytearray, without making it resident"""
+        if key in self.resident:
+            return self.resident[key]
+        data = self.encoded.get(key)
+        if data is None:
+            chunk_width, chunk_height = self.chunk_shape(key)
+            return bytearray((self.fill_byte,)) * (chunk_width * chunk_height)
+        return bytearray(zlib.decompress(data))
+
+    def chunk(self, key):
+        """Decoded chunk for reading and writing, made most recently used"""
+        chunk = self.resident.get(key)
+        if chunk is not None:
+            self.resident.move_to_end(key)
+            return chunk
+        chunk = self.decode(key)
+        self.resident[key] = chunk
+        while len(self.resident) > self.max_resident:
+            self.evict(*self.resident.popitem(last=False))
+        return chunk
+
+    def evict(self, key, chunk):
+        if key in self.dirty:
+            self.dirty.discard(key)
+            chunk_width = self.chunk_shape(key)[0]
+            self.store(key, [bytes(chunk[i:i + chunk_width]) for i in range(0, len(chunk), chunk_width)])
+
+    def flush(self):
+        """Write every modified resident chunk back to its compressed form"""
+        for key in list(self.dirty):
+            self.evict(key, self.resident[key])
+
+    def get(self, x, y):
+        size = self.chunk_size
+        chunk = self.chunk((x // size, y // size))
+        return chr(chunk[(y % size) * self.chunk_shape((x // size, y // size))[0] + x % size])
+
+    def set(self, x, y, symbol):
+        size = self.chunk_size
+        key = (x // size, y // size)
+        chunk = self.chunk(key)
+        chunk[(y % size) * self.chunk_shape(key)[0] + x % size] = ord(symbol)
+        self.dirty.add(key)
+
+    def read_span(self, x0, y, x1):
+        """Cells x0 up to (not including) x1 of row y, decoding only the chunks they cross"""
+        size = self.chunk_size
+        cy, row_offset = divmod(y, size)
+        parts = []
+        x = x0
+        while x < x1:
+            cx, column = divmod(x, size)
+            chunk_width = self.chunk_shape((cx, cy))[0]
+            count = min(x1 - x, chunk_width - column)
+            start = row_offset * chunk_width + column
+            parts.append(self.chunk((cx, cy))[start:start + count].decode('latin-1'))
+            x += count
+        return ''.join(parts)
+
+    def write_span(self, x0, y, symbols):
+        """Write a string over row y from x0, one slice assignment per chunk crossed"""
+        size = self.chunk_size
+        cy, row_offset = divmod(y, size)
+        data = symbols.encode('latin-1')
+        done = 0
+        while done < len(data):
+            x = x0 + done
+            cx, column = divmod(x, size)
+            chunk_width = self.chunk_shape((cx, cy))[0]
+            count = min(len(data) - done, chunk_width - column)
+            start = row_offset * chunk_width + column
+            self.chunk((cx, cy))[start:start + count] = data[done:done + count]
+            self.dirty.add((cx, cy))
+            done += count
+
+    def row_string(self, y):
+        size = self.chunk_size
+        cy, row_offset = divmod(y, size)
+        parts = []
+        for cx in range((self.width + size - 1) // size):
+            chunk_width = self.chunk_shape((cx, cy))[0]
+            start = row_offset * chunk_width
+            parts.append(self.chunk((cx, cy))[start:start + chunk_width].decode('latin-1'))
+        return ''.join(parts)
+
+    def rows(self):
+        """Every row as a string, decoding each chunk once without keeping it resident"""
+        size = self.chunk_size
+        for cy in range((self.height + size - 1) // size):
+            chunks = [self.decode((cx, cy)) for cx in range((self.width + size - 1) // size)]
+            widths = [self.chunk_shape((cx, cy))[0] for cx in range(len(chunks))]
+            for row_offset in range(self.chunk_shape((0, cy))[1]):
+                yield ''.join(chunk[row_offset * width:(row_offset + 1) * width].decode('latin-1')
+                              for chunk, width in zip(chunks, widths))
+
+    def positions(self, symbol):
+        """(x, y) of every cell holding symbol, in reading order"""
+        if symbol == self.fill:
+            return [(x, y) for y, row in enumerate(self.rows()) for x, cell in enumerate(row) if cell == symbol]
+        target = ord(symbol)
+        size = self.chunk_size
+        found = []
+        # Chunks that are all fill cannot hold anything else
+        for key in set(self.encoded) | set(self.resident):
+            chunk = self.decode(key)
+            chunk_width = self.chunk_shape(key)[0]
+            index = chunk.find(target)
+            while index != -1:
+                row_offset, column = divmod(index, chunk_width)
+                found.append((key[0] * size + column, key[1] * size + row_offset))
+                index = chunk.find(target, index + 1)
+        found.sort(key=lambda cell: (cell[1], cell[0]))
+        return found
+
+    def random_position(self, symbol, rng=random):
+        """A random cell holding symbol, looking in decoded chunks before compressed ones"""
+        if symbol == self.fill:
+            positions = self.positions(symbol)
+            return rng.choice(positions) if positions else None
+        resident = list(self.resident)
+        others = [key for key in self.encoded if key not in self.resident]
+        rng.shuffle(resident)
+        rng.shuffle(others)
+        target = ord(symbol)
+        size = self.chunk_size
+        for key in resident + others:
+            chunk = self.decode(key)
+            indices = [i for i, value in enumerate(chunk) if value == target]
+            if indices:
+                row_offset, column = divmod(rng.choice(indices), self.chunk_shape(key)[0])
+                return (key[0] * size + column, key[1] * size + row_offset)
+        return None
+
+    def count(self, symbol):
+        total = 0
+        stored = set(self.encoded) | set(self.resident)
+        for key in stored:
+            total += self.decode(key).count(ord(symbol))
+        if symbol == self.fill:
+            # Chunks that were never stored are all fill
+            size = self.chunk_size
+            for cy in range((self.height + size - 1) // size):
+                for cx in range((self.width + size - 1) // size):
+                    if (cx, cy) not in stored:
+                        chunk_width, chunk_height = self.chunk_shape((cx, cy))
+                        total += chunk_width * chunk_height
+        return total
+
+    def keep_resident(self, x0, y0, x1, y1):
+        """Decode the chunks covering a cell rectangle and mark them recently used"""
+        size = self.chunk_size
+        for cy in range(max(0, y0) // size, min(self.height - 1, y1) // size + 1):
+            for cx in range(max(0, x0) // size, min(self.width - 1, x1) // size + 1):
+                self.chunk((cx, cy))
@@ -0,0 +1,51 @@
+from constants import CELL_SIZE, CHUNK_SIZE
+from game_objects import Coin
+from maze_utils import MazeUtils
+from spatial_grid import SpatialGrid
+
+
+class CoinField:
+    """The coins of a level, created one chunk of cells at a time.
+
+    Every empty cell starts with a coin, but Coin objects for a chunk are
+    only built the first time that chunk is asked for, so a huge level
+    never holds more coins than the player has been near. Built coins are
+    bucketed per cell, so a query only touches the cells it covers. len()
+    counts the coins still to collect, built or not.
+    """
+    def __init__(self, maze, chunk_size=CHUNK_SIZE):
+        self.maze = maze
+        self.width = len(maze[0])
+        self.height = len(maze)
+        self.chunk_size = chunk_size
+        self.chunks = set()
+        self.grid = SpatialGrid(CELL_SIZE)
+        self.remaining = MazeUtils.count_cells(maze, ' ')
+
+    def __len__(self):
+        return self.remaining
+
+    def build_chunk(self, cx, cy):
+        self.chunks.add((cx, cy))
+        size = self.chunk_size
+        x0, x1 = cx * size, min(self.width, (cx + 1) * size)
+        for y in range(cy * size, min(self.height, (cy + 1) * size)):
+            for x, cell in enumerate(self.maze[y][x0:x1], x0):
+                if cell == ' ':
+                    # Center the coin in the cell
+                    self.grid.insert(Coin(x * CELL_SIZE + CELL_SIZE // 2, y * CELL_SIZE + CELL_SIZE // 2))
+
+    def near(self, min_x, min_y, max_x, max_y):
+        """Coins that may overlap a world-space rectangle"""
+        span = self.chunk_size * CELL_SIZE
+        max_cx = (self.width - 1) // self.chunk_size
+        max_cy = (self.height - 1) // self.chunk_size
+        for cy in range(max(0, int(min_y // span)), min(max_cy, int(max_y // span)) + 1):
+            for cx in range(max(0, int(min_x // span)), min(max_cx, int(max_x // span)) + 1):
+                if (cx, cy) not in self.chunks:
+                    self.build_chunk(cx, cy)
+        return list(self.grid.query_rect(min_x, min_y, max_x, max_y))
+
+    def remove(self, coin):
+        self.grid.remove(coin)
+        self.remaining -= 1
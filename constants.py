@@ -1,13 +1,25 @@
+import os
+
 FPS = 60
 WIDTH, HEIGHT = 800, 680
 CELL_SIZE = 20
-MAZE_WIDTH, MAZE_HEIGHT = 40, 30
+MAZE_WIDTH, MAZE_HEIGHT = 40, 30  # Default size of new levels; each Level carries its own
 SCORE_AREA_HEIGHT = 40
 ENEMY_SPEED = CELL_SIZE // 6
 PLAYER_SPEED = CELL_SIZE // 4
 ESCAPE_ROUTES = max(10, MAZE_WIDTH // 10)
 DEV_MODE = True
 ENEMY_CHASE_DELAY = 3
+PATH_WORKER = "thread"  # "thread", "process" or None to search on the main loop
+COOPERATIVE_PLANNING = True  # Plan groups of enemies together instead of one by one
+COOP_WINDOW = 8  # Cells of lookahead in the space-time reservation table
+COOP_STEP_TICKS = -(-CELL_SIZE // ENEMY_SPEED)  # Ticks an enemy takes to cross a cell: one plan step
+COOP_REPLAN_TICKS = COOP_WINDOW // 2 * COOP_STEP_TICKS  # Ticks between group re-plans (half a window)
+COOP_CROWD_PENALTY = 2  # Extra cost for entering a cell another enemy plans to use
+DISTANCE_TABLE_MAX_CELLS = 2048  # Largest walkable cell count that gets an all-pairs table
+DISTANCE_TABLE_CACHE_SIZE = 4  # Distance tables kept in memory, keyed by maze contents
+PATH_SEARCH_MAX_NODES = 20000  # Cells one enemy path search may expand before settling for the nearest
+INTERCEPT_LOOKAHEAD = 4  # Cells ahead of the player that intercepting enemies aim for
 COIN_RADIUS = CELL_SIZE // 7  # New constant for coin radius
 
 # Colors
@@ -23,6 +35,8 @@ RED = (255, 0, 0)
 GOLD = (255, 215, 0)
 CYAN = (0, 255, 255)  # New color for diamonds
 COIN_COLOR = YELLOW  # New constant for coin color
+MUD_COLOR = (150, 110, 70)
+CONVEYOR_COLOR = (170, 220, 255)
 
 # Theme Colors
 THEME_PRIMARY = (50, 50, 100)  # Dark blue
@@ -31,6 +45,7 @@ THEME_ACCENT = (255, 215, 0)  # Gold
 THEME_BACKGROUND = (20, 20, 50)  # Very dark blue
 THEME_TEXT = (255, 255, 255)  # White
 THEME_TEXT_SECONDARY = (200, 200, 200)  # Light gray
+OVERLAY_COLOR = (*THEME_BACKGROUND, 150)  # Semi-transparent panel behind play overlays
 
 # Player constants
 PLAYER_RADIUS = CELL_SIZE // 2.2  # Changed from CELL_SIZE // 3.2 back to original CELL_SIZE // 3
@@ -42,9 +57,100 @@ PARTICLE_FADE_SPEED = 5
 PARTICLE_SIZE = 3
 PARTICLE_COLOR = (135, 206, 235)  # Light blue
 
+# Terrain layer: each symbol's traversal cost (small integers keep bucket queues cheap)
+TERRAIN_NORMAL = '.'
+TERRAIN_MUD = '~'
+TERRAIN_CONVEYOR = '='
+TERRAIN_COSTS = {TERRAIN_NORMAL: 2, TERRAIN_MUD: 5, TERRAIN_CONVEYOR: 1}
+TERRAIN_COLORS = {TERRAIN_MUD: MUD_COLOR, TERRAIN_CONVEYOR: CONVEYOR_COLOR}
+
 # Game scoring
 COIN_VALUE = 10
 DIAMOND_VALUE = 10000
 
 # Timing
-LEVEL_START_DELAY = 2000  # 2 seconds
\ No newline at end of file
+LEVEL_START_DELAY = 2000  # 2 seconds
+
+# Shared text cache limits (fonts per face/size, rendered strings)
+TEXT_CACHE_MAX_FONTS = 32
+TEXT_CACHE_MAX_SURFACES = 512
+
+# Full-screen overlay layers kept by the overlay compositor
+OVERLAY_CACHE_SIZE = 6
+
+# Generated sound buffers are cached here between launches
+SOUND_CACHE_DIR = os.path.join(".cache", "sounds")
+# Level editor undo history: memory the strokes may hold (a byte per changed
+# cell plus a few per row span), and the window in which strokes with the
+# same brush merge into one undo step
+EDIT_HISTORY_MAX_BYTES = 32 * 1024 * 1024
+EDIT_COALESCE_MS = 400
+
+# Level editor reachability overlay: heatmap from the start cell, and open
+# cells the player cannot reach
+HEATMAP_NEAR_COLOR = (0, 200, 120, 110)
+HEATMAP_FAR_COLOR = (120, 0, 200, 110)
+UNREACHABLE_COLOR = (255, 40, 40, 150)
+
+# Levels with more cells than this keep their maze and terrain in compressed
+# CHUNK_SIZE x CHUNK_SIZE chunks, decoding at most CHUNK_MAX_RESIDENT at a time
+CHUNKED_LEVEL_CELLS = 256 * 256
+CHUNK_SIZE = 64
+CHUNK_MAX_RESIDENT = 64
+
+# Most cells the level editor shows at once; bigger levels scroll with the arrow keys
+EDITOR_VIEW_CELLS = (80, 60)
+
+# Cells pre-rendered around the visible area of the play field, so the
+# cached world layer survives a little camera movement before it is redrawn
+WORLD_LAYER_MARGIN = 6
+
+# Entity sprites kept pre-rendered, one per kind, on-screen size and colour
+SPRITE_CACHE_SIZE = 64
+
+# Play camera zoom: mouse wheel range and step, the share of the remaining
+# distance to the target zoom covered each update, and the zooms the world
+# layer is pre-rendered at while the camera is easing between them
+ZOOM_MIN = 2.0
+ZOOM_MAX = 6.0
+ZOOM_STEP = 0.25
+ZOOM_EASING = 0.2
+ZOOM_MIP_LEVELS = (2.0, 3.0, 4.0, 6.0)
+
+# Render every mode into a fixed WIDTH x HEIGHT surface and scale it to the
+# window once per frame (F9 toggles), smoothly or with nearest-neighbour
+# scaling (F10 toggles)
+LOGICAL_RENDER = False
+LOGICAL_SMOOTH_SCALING = True
+
+# Frames whose changed area covers at least this share of the screen are
+# presented with a full flip rather than a list of dirty rectangles
+DIRTY_FULL_SCREEN_SHARE = 0.5
+
+# Quality governor: frames averaged over QUALITY_WINDOW must stay within the
+# budget, quality only comes back once they fall under QUALITY_RESTORE_SHARE
+# of it, and at least QUALITY_COOLDOWN frames separate two changes. Each
+# tier keeps the cuts of the ones before it.
+QUALITY_FRAME_BUDGET_MS = 1000 / FPS
+QUALITY_WINDOW = 60
+QUALITY_RESTORE_SHARE = 0.6
+QUALITY_COOLDOWN = 120
+QUALITY_HISTORY_SIZE = 32
+# Colour punched out of the fog mask when per-pixel alpha fog is off
+FOG_CLEAR_KEY = (255, 0, 255)
+QUALITY_TIERS = (
+    {"name": "full", "particle_cap": None, "alpha_fog": True, "trail_gradients": True, "render_scale": 1.0},
+    {"name": "fewer particles", "particle_cap": 8, "alpha_fog": True, "trail_gradients": True, "render_scale": 1.0},
+    {"name": "hard fog", "particle_cap": 8, "alpha_fog": False, "trail_gradients": True, "render_scale": 1.0},
+    {"name": "flat trails", "particle_cap": 8, "alpha_fog": False, "trail_gradients": False, "render_scale": 1.0},
+    {"name": "low resolution", "particle_cap": 8, "alpha_fog": False, "trail_gradients": False, "render_scale": 0.75},
+)
+
+# Frame pacing: the simulation always ticks TICK_RATE times a second while
+# rendering is capped separately (None renders as often as ticks allow).
+# Waits sleep until SLEEP_SPIN_MS before the deadline and spin the rest, and
+# at most MAX_CATCH_UP_TICKS run back to back before the backlog is dropped.
+TICK_RATE = 60
+RENDER_FPS_CAP = FPS
+SLEEP_SPIN_MS = 1
+MAX_CATCH_UP_TICKS = 5
@@ -0,0 +1,96 @@
+import heapq
+
+from constants import *
+from maze_utils import MazeUtils, AStar
+
+
+class CooperativePlanner:
+    """Plans a group of enemies together with a windowed space-time reservation table.
+
+    Agents are planned one after another over the next `window` steps. Each
+    finished plan reserves its (cell, step) pairs, so later agents route
+    around it, and cells already claimed by another agent cost extra to
+    enter so the group spreads out over alternative corridors. The step
+    distance to each agent's goal is the search heuristic; it comes from the
+    level's distance table when there is one.
+    """
+    def __init__(self, maze, distance_table=None, window=COOP_WINDOW, crowd_penalty=COOP_CROWD_PENALTY):
+        self.astar = AStar(maze)
+        self.maze = maze
+        self.distance_table = distance_table
+        self.window = window
+        self.crowd_penalty = crowd_penalty
+        self.distance_fields = {}
+
+    def distances_to(self, goal):
+        # Agents share goals, so each distance field is built once per re-plan
+        if goal not in self.distance_fields:
+            if self.distance_table is not None:
+                self.distance_fields[goal] = self.distance_table.distances_to(goal)
+            else:
+                self.distance_fields[goal] = MazeUtils.distance_field(self.maze, goal)
+        return self.distance_fields[goal]
+
+    def plan(self, starts, goals):
+        """Returns one path (list of cells beginning at its start) per start and goal cell"""
+        self.distance_fields = {}
+        fields = [self.distances_to(goal) for goal in goals]
+        reserved = set()
+        reserved_edges = set()
+        crowded = set()
+        paths = [None] * len(starts)
+
+        # Agents nearest the goal take the direct route; the rest plan around them
+        order = sorted(range(len(starts)), key=lambda i: fields[i].get(starts[i], float('inf')))
+        for i in order:
+            path = self.plan_agent(starts[i], goals[i], fields[i], reserved, reserved_edges, crowded)
+            for step, cell in enumerate(path):
+                reserved.add((cell, step))
+                if step:
+                    # Forbid later agents from swapping through this agent head-on
+                    reserved_edges.add((cell, path[step - 1], step))
+            # An agent that stops early keeps holding its last cell for the window
+            for step in range(len(path), self.window + 1):
+                reserved.add((path[-1], step))
+            crowded.update(path)
+            paths[i] = path
+        return paths
+
+    def plan_agent(self, start, goal, distances, reserved, reserved_edges, crowded):
+        if start not in distances:
+            return [start]
+
+        frontier = [(distances[start], 0, 0, start)]
+        came_from = {(start, 0): None}
+        cost_so_far = {(start, 0): 0}
+        best = (start, 0)
+
+        while frontier:
+            _, cost, step, cell = heapq.heappop(frontier)
+            if cost > cost_so_far[(cell, step)]:
+                continue
+            if cell == goal or step == self.window:
+                best = (cell, step)
+                break
+
+            for next in self.astar.get_neighbors(cell) + [cell]:
+                state = (next, step + 1)
+                # Any number of enemies may converge on the goal itself
+                if next != goal and (state in reserved or (cell, next, step + 1) in reserved_edges):
+                    continue
+                new_cost = cost + 1
+                if next != cell and next in crowded:
+                    new_cost += self.crowd_penalty
+                if state not in cost_so_far or new_cost < cost_so_far[state]:
+                    cost_so_far[state] = new_cost
+                    came_from[state] = (cell, step)
+                    priority = new_cost + distances.get(next, float('inf'))
+                    heapq.heappush(frontier, (priority, new_cost, step + 1, next))
+
+        path = []
+        state = best
+        while state is not None:
+            path.append(state[0])
+            state = came_from[state]
+        path.reverse()
+        return path
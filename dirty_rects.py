@@ -0,0 +1,38 @@
+import pygame
+
+from constants import DIRTY_FULL_SCREEN_SHARE
+
+
+class DirtyRects:
+    """Screen areas that changed since the last presented frame.
+
+    Modes report what their animations touch each frame, and any event
+    marks the whole screen, since input may change anything. take() turns
+    the marks into the rectangles to redraw and present: an empty list
+    means the frame can be skipped, and None means the whole screen.
+    """
+    def __init__(self, full_share=DIRTY_FULL_SCREEN_SHARE):
+        self.full_share = full_share
+        self.full = True
+        self.rects = []
+
+    def mark(self, rect):
+        if not self.full:
+            self.rects.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        self.full = True
+        self.rects = []
+
+    def take(self, screen_size):
+        screen_rect = pygame.Rect((0, 0), screen_size)
+        rects = None
+        if not self.full:
+            rects = [rect.clip(screen_rect) for rect in self.rects]
+            rects = [rect for rect in rects if rect.width and rect.height]
+            # Past a point, one flip is cheaper than many small updates
+            if sum(rect.width * rect.height for rect in rects) >= self.full_share * screen_rect.width * screen_rect.height:
+                rects = None
+        self.full = False
+        self.rects = []
+        return rects
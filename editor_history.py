@@ -0,0 +1,208 @@
+from array import array
+from bisect import bisect_right
+
+from constants import EDIT_HISTORY_MAX_BYTES, EDIT_COALESCE_MS
+
+LAYERS = ("maze", "terrain")
+
+
+class Stroke:
+    """One undoable edit, stored as the row spans it changed and nothing else.
+
+    Each span packs layer, x0 and y into one integer of `positions`, with
+    its length in `lengths`, the single symbol written over it in `new` and
+    the symbols it held before appended to `old`, all as latin-1 bytes like
+    the chunked grid stores them. A rectangle or fill is one span per row;
+    brush cells that land next to the previous one extend its span. A cell
+    is only ever held once, with the symbol it had before the stroke.
+    """
+    # Bytes a span costs on top of one per cell: position, length and new symbol
+    SPAN_BYTES = 8 + 4 + 1
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.end_time = 0
+        self.positions = array('Q')
+        self.lengths = array('L')
+        self.new = bytearray()
+        self.old = bytearray()
+        self.rows = {}  # (layer, y) -> sorted (start, end) runs held; dropped once the stroke closes
+
+    def __len__(self):
+        return len(self.old)
+
+    def nbytes(self):
+        return len(self.positions) * self.SPAN_BYTES + len(self.old)
+
+    @staticmethod
+    def pack(layer, x, y):
+        return (y << 33) | (x << 1) | LAYERS.index(layer)
+
+    @staticmethod
+    def unpack(position):
+        return LAYERS[position & 1], (position >> 1) & 0xFFFFFFFF, position >> 33
+
+    def spans(self):
+        """Yield (layer, y, x0, old, new) for every span, oldest first"""
+        offset = 0
+        for position, length, new in zip(self.positions, self.lengths, self.new):
+            layer, x0, y = self.unpack(position)
+            yield layer, y, x0, self.old[offset:offset + length].decode('latin-1'), chr(new)
+            offset += length
+
+    def index(self):
+        """Runs held per row, rebuilt from the packed spans when needed"""
+        if self.rows is None:
+            self.rows = {}
+            for layer, y, x0, old, new in self.spans():
+                self.cover(layer, y, x0, x0 + len(old))
+        return self.rows
+
+    def close(self):
+        self.rows = None
+
+    def cover(self, layer, y, start, end):
+        runs = self.rows.setdefault((layer, y), [])
+        i = bisect_right(runs, (start,))
+        if i and runs[i - 1][1] >= start:
+            i -= 1
+            start = runs[i][0]
+        j = i
+        while j < len(runs) and runs[j][0] <= end:
+            end = max(end, runs[j][1])
+            j += 1
+        runs[i:j] = [(start, end)]
+
+    def uncovered(self, layer, y, start, end):
+        """Parts of [start, end) in the row that this stroke does not hold yet"""
+        runs = self.index().get((layer, y), ())
+        i = max(0, bisect_right(runs, (start,)) - 1)
+        for run_start, run_end in runs[i:]:
+            if run_start >= end:
+                break
+            if run_start > start:
+                yield start, run_start
+            start = max(start, run_end)
+        if start < end:
+            yield start, end
+
+    def add(self, layer, y, x0, old, new):
+        """Hold a span, skipping cells already held and extending the last span where it continues"""
+        for start, end in list(self.uncovered(layer, y, x0, x0 + len(old))):
+            self.append(layer, y, start, old[start - x0:end - x0], new)
+            self.cover(layer, y, start, end)
+
+    def append(self, layer, y, x0, old, new):
+        new = ord(new)
+        if self.positions:
+            last_layer, last_x0, last_y = self.unpack(self.positions[-1])
+            if (last_layer, last_y, self.new[-1]) == (layer, y, new) and last_x0 + self.lengths[-1] == x0:
+                self.lengths[-1] += len(old)
+                self.old += old.encode('latin-1')
+                return
+        self.positions.append(self.pack(layer, x0, y))
+        self.lengths.append(len(old))
+        self.new.append(new)
+        self.old += old.encode('latin-1')
+
+    def merge(self, other):
+        """Fold a later stroke into this one, keeping the earliest old symbol per cell.
+
+        Strokes only merge with the same brush, so a cell held by both was
+        written the same symbol both times.
+        """
+        for layer, y, x0, old, new in other.spans():
+            self.add(layer, y, x0, old, new)
+        self.close()
+        self.end_time = other.end_time
+
+
+class EditHistory:
+    """Undo/redo stacks for one level.
+
+    Edits are grouped into strokes between begin_stroke() and end_stroke().
+    A stroke that starts within EDIT_COALESCE_MS of the previous one with
+    the same symbol is merged into it. The oldest strokes are dropped once
+    the stacks hold more than max_bytes, counted as Stroke.nbytes(). A
+    single stroke bigger than that cannot be undone, so it clears the
+    history.
+    """
+    def __init__(self, max_bytes=EDIT_HISTORY_MAX_BYTES, coalesce_ms=EDIT_COALESCE_MS):
+        self.max_bytes = max_bytes
+        self.coalesce_ms = coalesce_ms
+        self.undo_stack = []
+        self.redo_stack = []
+        self.byte_count = 0
+        self.pending = None
+        self.pending_start = 0
+        self.overflowed = False
+
+    def begin_stroke(self, symbol, now):
+        self.pending = Stroke(symbol)
+        self.pending_start = now
+        self.overflowed = False
+
+    def record(self, layer, x, y, old, new):
+        self.record_span(layer, x, y, old, new)
+
+    def record_span(self, layer, x0, y, old_cells, new):
+        """Record a run of cells starting at x0 that were all set to new"""
+        if self.pending is None or self.overflowed:
+            return
+        old = ''.join(old_cells)
+        if old == new * len(old):
+            return
+        self.pending.add(layer, y, x0, old, new)
+        if self.pending.nbytes() > self.max_bytes:
+            self.overflow()
+
+    def overflow(self):
+        # Too big to keep; earlier steps would no longer undo cleanly past it either
+        self.overflowed = True
+        self.pending = Stroke(self.pending.symbol)
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.byte_count = 0
+
+    def end_stroke(self, now):
+        stroke, self.pending = self.pending, None
+        if stroke is None or not len(stroke):
+            return
+        stroke.close()
+        stroke.end_time = now
+
+        previous = self.undo_stack[-1] if self.undo_stack and not self.redo_stack else None
+        if (previous is not None and previous.symbol == stroke.symbol and
+                self.pending_start - previous.end_time <= self.coalesce_ms):
+            self.byte_count -= previous.nbytes()
+            previous.merge(stroke)
+            self.byte_count += previous.nbytes()
+        else:
+            self.undo_stack.append(stroke)
+            self.byte_count += stroke.nbytes()
+        self.clear_redo()
+        self.trim()
+
+    def clear_redo(self):
+        self.byte_count -= sum(stroke.nbytes() for stroke in self.redo_stack)
+        self.redo_stack.clear()
+
+    def trim(self):
+        while self.byte_count > self.max_bytes and self.undo_stack:
+            self.byte_count -= self.undo_stack.pop(0).nbytes()
+
+    def undo(self):
+        """Pop the latest stroke; returns (layer, y, x0, symbols) spans to restore, newest first"""
+        if not self.undo_stack:
+            return []
+        stroke = self.undo_stack.pop()
+        self.redo_stack.append(stroke)
+        return [(layer, y, x0, old) for layer, y, x0, old, new in reversed(list(stroke.spans()))]
+
+    def redo(self):
+        """Re-apply the latest undone stroke; returns (layer, y, x0, symbols) spans to write"""
+        if not self.redo_stack:
+            return []
+        stroke = self.redo_stack.pop()
+        self.undo_stack.append(stroke)
+        return [(layer, y, x0, new * len(old)) for layer, y, x0, old, new in stroke.spans()]
@@ -0,0 +1,80 @@
+import time
+
+from constants import TICK_RATE, RENDER_FPS_CAP, SLEEP_SPIN_MS, MAX_CATCH_UP_TICKS
+
+
+class FrameScheduler:
+    """Paces the main loop: fixed-rate simulation ticks and capped rendering.
+
+    due_ticks() says how many ticks to run now, interpolation() how far the
+    frame is into the next one, and wait() sleeps until the next tick or
+    render slot, whichever comes first. Sleeping stops short of the
+    deadline and spins the rest, since sleep() can overshoot; the spin
+    tracks twice the overshoot actually seen, up to `spin_ms`.
+
+    Ticks run more than a whole period after they were due count as late;
+    a backlog beyond `max_catch_up` is dropped and counted as skipped
+    rather than replayed.
+    """
+    def __init__(self, tick_rate=TICK_RATE, render_cap=RENDER_FPS_CAP, spin_ms=SLEEP_SPIN_MS,
+                 max_catch_up=MAX_CATCH_UP_TICKS, clock=time.perf_counter):
+        self.tick_period = 1 / tick_rate
+        self.render_period = 1 / render_cap if render_cap else 0.0
+        self.max_spin = spin_ms / 1000
+        self.spin = self.max_spin
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        now = clock()
+        self.next_tick = now
+        self.next_render = now
+        self.ticks = 0
+        self.late_ticks = 0
+        self.skipped_ticks = 0
+        self.frames = 0
+
+    def due_ticks(self):
+        now = self.clock()
+        due = int((now - self.next_tick) // self.tick_period) + 1 if now >= self.next_tick else 0
+        if due > self.max_catch_up:
+            # Too far behind to catch up without a visible burst; drop the rest
+            self.skipped_ticks += due - self.max_catch_up
+            self.next_tick = now - (self.max_catch_up - 1) * self.tick_period
+            due = self.max_catch_up
+        if due > 1:
+            self.late_ticks += due - 1
+        self.ticks += due
+        self.next_tick += due * self.tick_period
+        return due
+
+    def interpolation(self):
+        """Share of a tick period elapsed since the last tick ran, from 0 to 1"""
+        elapsed = self.clock() - (self.next_tick - self.tick_period)
+        return min(1.0, max(0.0, elapsed / self.tick_period))
+
+    def frame_rendered(self):
+        self.frames += 1
+        # Keep the render cadence steady, but never bank time after a slow frame
+        self.next_render = max(self.next_render + self.render_period, self.clock())
+
+    def wait(self):
+        """Sleep until the next tick is due or rendering is allowed again"""
+        deadline = min(self.next_tick, self.next_render) if self.render_period else self.next_tick
+        remaining = deadline - self.clock()
+        if remaining > self.spin:
+            started = self.clock()
+            time.sleep(remaining - self.spin)
+            overshoot = max(0.0, self.clock() - started - (remaining - self.spin))
+            self.spin = min(self.max_spin, 0.9 * self.spin + 0.2 * overshoot)
+        while self.clock() < deadline:
+            pass
+
+    def render_due(self):
+        return self.clock() >= self.next_render
+
+    def stats(self):
+        return {
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+            "skipped_ticks": self.skipped_ticks,
+            "frames": self.frames,
+        }
@@ -1,9 +1,11 @@
 import os
 import sys
+import time
 
 import pygame
 import pygame.gfxdraw
-from constants import WIDTH, HEIGHT, SCORE_AREA_HEIGHT, MAZE_WIDTH, CELL_SIZE, FPS
+from constants import WIDTH, HEIGHT, SCORE_AREA_HEIGHT, MAZE_WIDTH, CELL_SIZE, DEV_MODE, ZOOM_EASING
+from constants import LOGICAL_RENDER, LOGICAL_SMOOTH_SCALING, FOG_CLEAR_KEY
 from level_manager import LevelManager
 from sound_manager import SoundManager  # Add this import
 
@@ -12,23 +14,62 @@ from runner_customization_mode import RunnerCustomizationMode
 from level_editor_mode import LevelEditorMode
 from play_mode import PlayMode, GameState  # Add GameState import here
 from shop_mode import ShopMode
+from startup import StartupPipeline
+from text_cache import TextCache
+from overlay_compositor import OverlayCompositor
+from sprite_cache import SpriteCache
+from dirty_rects import DirtyRects
+from quality_governor import QualityGovernor
+from frame_scheduler import FrameScheduler
+
+# Events that can change anything on screen, so the next frame redraws it all.
+# Others, such as mouse motion, leave it to the mode to mark what it changes.
+REDRAW_EVENTS = {
+    pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+    pygame.MOUSEWHEEL, pygame.ACTIVEEVENT, pygame.VIDEOEXPOSE, pygame.VIDEORESIZE,
+    pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED,
+    pygame.WINDOWSIZECHANGED, pygame.WINDOWFOCUSGAINED, pygame.WINDOWFOCUSLOST,
+}
 
 class Game:
     def __init__(self):
-        pygame.init()
+        # Everything before the first menu frame goes through the startup pipeline
+        self.startup = StartupPipeline()
+        self.startup.run("pygame.init", pygame.init)
         # Store original dimensions
         self.window_width = WIDTH
         self.window_height = HEIGHT
         self.is_fullscreen = False
-        self.screen = pygame.display.set_mode((self.window_width, self.window_height))
+        self.display = self.startup.run("display", pygame.display.set_mode, (self.window_width, self.window_height))
         pygame.display.set_caption("Labyrinth Runner")
+        # Modes draw on screen, which is either the display itself or a fixed-size
+        # logical surface that present() scales onto the display
+        self.logical_render = LOGICAL_RENDER
+        self.smooth_scaling = LOGICAL_SMOOTH_SCALING
+        self.logical_rect = None
+        # Regions to redraw and present; idle frames are skipped entirely
+        self.dirty = DirtyRects()
+        # Trades visual extras for frame time during play
+        self.quality_governor = QualityGovernor()
+        self.quality = self.quality_governor.settings
+        self.render_scale = self.quality["render_scale"]
+        self.screen = None
+        self.screen = self.render_target()
         self.clock = pygame.time.Clock()
+        # Fonts and rendered strings shared by every mode
+        self.text_cache = TextCache()
+        # Translucent overlays with their static text, cached per screen size
+        self.overlays = OverlayCompositor()
+        # Enemy and pickup visuals, baked per on-screen size
+        self.sprite_cache = SpriteCache()
         
+        # Levels and sounds don't need the display, so they load while the menu comes up
         self.level_manager = LevelManager("levels.json")
-        self.level_manager.load_or_generate_levels()
+        self.startup.submit("levels", self.level_manager.load_or_generate_levels)
 
         # Initialize the sound manager
-        self.sound_manager = SoundManager()
+        self.sound_manager = self.startup.run("mixer", SoundManager)
+        self.startup.submit("sounds", self.sound_manager.load_sounds)
 
         self.offset_x = (WIDTH - MAZE_WIDTH * CELL_SIZE) // 2
         self.offset_y = SCORE_AREA_HEIGHT
@@ -37,32 +78,35 @@ class Game:
         # Initialize modes dictionary
         self.modes = {}
         
-        # Create instances of game modes
-        self.modes["menu"] = MenuMode(self)
-        self.modes["shop"] = ShopMode(self)
-        self.modes["runner_customization"] = RunnerCustomizationMode(self)
-        self.modes["level_editor"] = LevelEditorMode(self, self.level_manager)
-        self.modes["play"] = PlayMode(self, self.level_manager)
+        # Only the menu is built up front; the other modes are built on first set_mode
+        self.mode_factories = {
+            "shop": lambda: ShopMode(self),
+            "runner_customization": lambda: RunnerCustomizationMode(self),
+            "level_editor": lambda: LevelEditorMode(self, self.level_manager),
+            "play": lambda: PlayMode(self, self.level_manager),
+        }
+        self.modes["menu"] = self.startup.run("menu", MenuMode, self)
+        for mode_name in self.mode_factories:
+            self.startup.defer(mode_name)
         
         self.current_mode = self.modes["menu"]
 
-        # Fixed timestep variables
-        self.TICKS_PER_SECOND = 60
-        self.SKIP_TICKS = 1000 / self.TICKS_PER_SECOND
-        self.MAX_FRAMESKIP = 5
+        # Fixed-rate simulation ticks and capped rendering
+        self.scheduler = FrameScheduler()
 
-        self.fps_font = pygame.font.Font(None, 30)
+        self.fps_font = self.text_cache.font(30)
         self.fps = 0
         self.fps_update_time = 0
 
         # Fog of war settings
         self.fog_radius = 3  # Number of cells visible around the player
-        self.fog_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        self.fog_surface = self.make_fog_surface(self.screen.get_size())
 
         # Camera/viewport settings
         self.camera_x = 0
         self.camera_y = 0
         self.zoom = 4.0  # Increased from 2.0 to 4.0 for 2x more zoom
+        self.target_zoom = self.zoom  # The mouse wheel moves this; zoom eases toward it
         
         # Calculate the visible area (adjusted for zoom)
         self.viewport_width = WIDTH / self.zoom
@@ -77,84 +121,215 @@ class Game:
     def play_star_consume_sound(self):
         self.sound_manager.play_sound('star_consume')
 
+    def get_mode(self, mode_name):
+        """Return a mode, building it the first time it is asked for"""
+        if mode_name not in self.modes:
+            # Modes read levels as they are built
+            self.startup.wait("levels")
+            self.modes[mode_name] = self.startup.run(mode_name, self.mode_factories[mode_name])
+        return self.modes[mode_name]
+
+    def levels_ready(self):
+        return self.startup.is_ready("levels")
+
     def set_mode(self, mode_name):
-        self.current_mode = self.modes[mode_name]
+        self.current_mode = self.get_mode(mode_name)
+        self.dirty.mark_all()
         if mode_name == "play":
-            self.modes["play"].start_level()
+            self.current_mode.start_level()
+
+    def set_zoom(self, zoom):
+        self.zoom = zoom
+        width, height = self.screen.get_size()
+        self.viewport_width = width / zoom
+        self.viewport_height = (height - SCORE_AREA_HEIGHT) / zoom
 
-    def update_fog_of_war(self, player_x, player_y):
+    def update_zoom(self):
+        """Move zoom part of the way toward target_zoom, snapping once it is close"""
+        if self.zoom == self.target_zoom:
+            return
+        zoom = self.zoom + (self.target_zoom - self.zoom) * ZOOM_EASING
+        if abs(self.target_zoom - zoom) < 0.01:
+            zoom = self.target_zoom
+        self.set_zoom(zoom)
+
+    def make_fog_surface(self, size):
+        if self.quality["alpha_fog"]:
+            return pygame.Surface(size, pygame.SRCALPHA)
+        # A colour-keyed mask blits far faster than per-pixel alpha
+        surface = pygame.Surface(size).convert()
+        surface.set_colorkey(FOG_CLEAR_KEY)
+        return surface
+
+    def update_fog_of_war(self, camera, player_x, player_y):
         # Fill with completely opaque black (alpha = 255)
         self.fog_surface.fill((0, 0, 0, 255))
         
         # Convert player world coordinates to screen coordinates
-        screen_x = (player_x - self.camera_x) * self.zoom
-        screen_y = (player_y - self.camera_y) * self.zoom + SCORE_AREA_HEIGHT
+        screen_x = (player_x - camera.camera_x) * camera.zoom
+        screen_y = (player_y - camera.camera_y) * camera.zoom + SCORE_AREA_HEIGHT
         
         # Scale the fog radius according to zoom
-        scaled_radius = self.fog_radius * CELL_SIZE * self.zoom
+        scaled_radius = self.fog_radius * CELL_SIZE * camera.zoom
         
         # Create a fully transparent circle (alpha = 0) around the player's screen position
-        pygame.draw.circle(self.fog_surface, (0, 0, 0, 0), 
+        clear = (0, 0, 0, 0) if self.quality["alpha_fog"] else FOG_CLEAR_KEY
+        pygame.draw.circle(self.fog_surface, clear, 
                           (int(screen_x), int(screen_y)), 
                           int(scaled_radius))
 
     def render(self, screen, interpolation):
+        regions = self.current_mode.changed_regions(screen)
+        if regions is None:
+            self.dirty.mark_all()
+        else:
+            for rect in regions:
+                self.dirty.mark(rect)
+        rects = self.dirty.take(screen.get_size())
+        if rects == []:
+            return False  # Nothing changed since the last frame
+
+        # Modes still draw everything, but the clip confines the work to what changed
+        if rects is not None:
+            screen.set_clip(rects[0].unionall(rects[1:]))
+        self.render_mode(screen, interpolation)
+        screen.set_clip(None)
+        self.present(rects)
+        return True
+
+    def render_mode(self, screen, interpolation):
         if isinstance(self.current_mode, PlayMode):
-            # Get player position before rendering UI elements
-            player = self.current_mode.player
-            if player is None:
+            # Draw between the last two published ticks, never from live objects
+            view, camera = self.current_mode.frame_view(interpolation)
+            if view is None:
                 return
             
             # First render the game elements
             screen.fill((0, 0, 0))
-            self.current_mode.render_maze(screen)
-            
-            # Only apply interpolation if the player is moving
-            if player.is_moving:
-                self.current_mode.render_game_objects(screen, interpolation)
-            else:
-                # Render without interpolation when player is stationary
-                self.current_mode.render_game_objects(screen, 0)
+            self.current_mode.render_maze(screen, view, camera)
+            self.current_mode.render_game_objects(screen, view, camera)
             
             # Then render the fog of war
-            self.update_fog_of_war(player.x, player.y)
+            self.update_fog_of_war(camera, view.player.x, view.player.y)
             screen.blit(self.fog_surface, (0, 0))
             
             # Finally render the UI elements and overlays
-            self.current_mode.render_ui_elements(screen)
-            self.current_mode.render_state_overlay(screen)
+            self.current_mode.render_ui_elements(screen, view)
+            self.current_mode.render_state_overlay(screen, view)
         else:
             # For non-PlayMode screens, just use their normal render
             self.current_mode.render(screen, interpolation)
 
         self.update_fps()
         self.draw_fps(screen)
-        pygame.display.flip()
 
-    def run(self):
-        next_game_tick = pygame.time.get_ticks()
-        loops = 0
+    def render_target(self):
+        """The display itself, or a surface that present() scales onto it.
 
+        In logical mode that surface is WIDTH x HEIGHT, letterboxed on the
+        display; render_scale below 1 shrinks it, or the display-sized
+        surface used outside logical mode, by that factor.
+        """
+        if not self.logical_render and self.render_scale == 1.0:
+            self.logical_rect = None
+            return self.display
+        display_width, display_height = self.display.get_size()
+        base_width, base_height = (WIDTH, HEIGHT) if self.logical_render else (display_width, display_height)
+        scale = min(display_width / base_width, display_height / base_height)
+        self.logical_rect = pygame.Rect(0, 0, round(base_width * scale), round(base_height * scale))
+        self.logical_rect.center = (display_width // 2, display_height // 2)
+        # The bars around the scaled image are never drawn over, so clear them once
+        self.display.fill((0, 0, 0))
+        self.dirty.mark_all()
+        size = (max(1, round(base_width * self.render_scale)), max(1, round(base_height * self.render_scale)))
+        if self.screen is not None and self.screen is not self.display and self.screen.get_size() == size:
+            return self.screen
+        return pygame.Surface(size).convert()
+
+    def present(self, rects=None):
+        """Show the frame, updating only rects when given"""
+        if self.logical_rect is not None:
+            if self.logical_rect.size == self.screen.get_size():
+                self.display.blit(self.screen, self.logical_rect)
+            else:
+                # The scaled image is redrawn whole, so present it whole
+                scale = pygame.transform.smoothscale if self.smooth_scaling else pygame.transform.scale
+                scale(self.screen, self.logical_rect.size, self.display.subsurface(self.logical_rect))
+                rects = None
+            if rects is not None:
+                rects = [rect.move(self.logical_rect.topleft) for rect in rects]
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def logical_pos(self, pos):
+        """Map a window position to the screen surface the modes draw on"""
+        if self.logical_rect is None:
+            return pos
+        screen_width, screen_height = self.screen.get_size()
+        return ((pos[0] - self.logical_rect.x) * screen_width // self.logical_rect.width,
+                (pos[1] - self.logical_rect.y) * screen_height // self.logical_rect.height)
+
+    def record_frame_time(self, frame_ms):
+        settings = self.quality_governor.record(frame_ms)
+        if settings is not None:
+            self.apply_quality(settings)
+            if DEV_MODE:
+                print(f"Quality: {settings['name']} ({self.quality_governor.telemetry()['history'][-1]})")
+
+    def apply_quality(self, settings):
+        self.quality = settings
+        if settings["render_scale"] != self.render_scale:
+            # Zoom is in screen pixels, so it follows the resolution to keep the same view
+            ratio = settings["render_scale"] / self.render_scale
+            self.render_scale = settings["render_scale"]
+            self.target_zoom *= ratio
+            self.zoom *= ratio
+            self.screen = self.render_target()
+        self.on_display_changed()
+        for mode in self.modes.values():
+            if hasattr(mode, 'on_quality_change'):
+                mode.on_quality_change(settings)
+
+    def run(self):
+        scheduler = self.scheduler
         while self.running:
-            loops = 0
-            while pygame.time.get_ticks() > next_game_tick and loops < self.MAX_FRAMESKIP:
+            frame_start = time.perf_counter()
+            for _ in range(scheduler.due_ticks()):
                 self.handle_events()
                 self.current_mode.update()
-                
-                next_game_tick += self.SKIP_TICKS
-                loops += 1
 
-            # Calculate interpolation for smooth rendering
-            interpolation = (pygame.time.get_ticks() + self.SKIP_TICKS - next_game_tick) / self.SKIP_TICKS
+            if scheduler.render_due():
+                # Interpolation covers the time since the last tick
+                drawn = self.render(self.screen, scheduler.interpolation())
+                scheduler.frame_rendered()
+                self.clock.tick()  # Only measures, for the FPS counter
+                # Only play frames drive the quality governor; the other screens are cheap
+                if drawn and isinstance(self.current_mode, PlayMode):
+                    self.record_frame_time((time.perf_counter() - frame_start) * 1000)
+                if self.startup.first_frame_ms is None:
+                    self.startup.mark_first_frame()
+                    if DEV_MODE:
+                        print("\n".join(self.startup.report()))
+            scheduler.wait()
+
+        if DEV_MODE:
+            print(f"Frame pacing: {scheduler.stats()}")
 
-            self.render(self.screen, interpolation)
-            self.clock.tick(FPS)  # Limit to 60 FPS
+        # Let modes stop any background work before tearing down pygame
+        for mode in self.modes.values():
+            if hasattr(mode, 'shutdown'):
+                mode.shutdown()
+        self.startup.shutdown()
 
         pygame.quit()
         sys.exit()
 
     def handle_events(self):
         for event in pygame.event.get():
+            if event.type in REDRAW_EVENTS:
+                self.dirty.mark_all()
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
@@ -164,9 +339,17 @@ class Game:
                 # Handle Alt+Enter for fullscreen toggle
                 elif event.key == pygame.K_RETURN and (pygame.key.get_mods() & pygame.KMOD_ALT):
                     self.toggle_fullscreen()
+                elif event.key == pygame.K_F9:
+                    self.logical_render = not self.logical_render
+                    self.screen = self.render_target()
+                    self.on_display_changed()
+                elif event.key == pygame.K_F10:
+                    self.smooth_scaling = not self.smooth_scaling
                 else:
                     self.current_mode.handle_event(event)
             else:
+                if hasattr(event, 'pos'):
+                    event.pos = self.logical_pos(event.pos)
                 self.current_mode.handle_event(event)
 
     def update_fps(self):
@@ -194,38 +377,42 @@ class Game:
         try:
             self.is_fullscreen = not self.is_fullscreen
             if self.is_fullscreen:
-                self.window_width, self.window_height = self.screen.get_size()
-                self.screen = pygame.display.set_mode(
+                self.window_width, self.window_height = self.display.get_size()
+                self.display = pygame.display.set_mode(
                     (0, 0),
                     pygame.FULLSCREEN | pygame.HWSURFACE | pygame.DOUBLEBUF
                 )
             else:
-                self.screen = pygame.display.set_mode(
+                self.display = pygame.display.set_mode(
                     (self.window_width, self.window_height),
                     pygame.HWSURFACE | pygame.DOUBLEBUF
                 )
-            
-            # Get new screen dimensions
-            current_width, current_height = self.screen.get_size()
-            
-            # Update fog surface for new dimensions
-            self.fog_surface = pygame.Surface((current_width, current_height), pygame.SRCALPHA)
-            
-            # Update viewport dimensions based on new screen size
-            self.viewport_width = current_width / self.zoom
-            self.viewport_height = (current_height - SCORE_AREA_HEIGHT) / self.zoom
-            
-            # Notify current mode of screen resize
-            if hasattr(self.current_mode, 'on_screen_resize'):
-                self.current_mode.on_screen_resize(current_width, current_height)
+            self.screen = self.render_target()
+            self.on_display_changed()
             
         except pygame.error:
             print("Failed to toggle fullscreen mode. Reverting to windowed mode.")
             self.is_fullscreen = False
-            self.screen = pygame.display.set_mode(
+            self.display = pygame.display.set_mode(
                 (self.window_width, self.window_height),
                 pygame.HWSURFACE | pygame.DOUBLEBUF
             )
+            self.screen = self.render_target()
+
+    def on_display_changed(self):
+        self.dirty.mark_all()
+        # Get new screen dimensions; a logical screen keeps its size
+        current_width, current_height = self.screen.get_size()
+        
+        # Update fog surface for new dimensions
+        self.fog_surface = self.make_fog_surface((current_width, current_height))
+        
+        # Update viewport dimensions based on new screen size
+        self.set_zoom(self.zoom)
+        
+        # Notify current mode of screen resize
+        if hasattr(self.current_mode, 'on_screen_resize'):
+            self.current_mode.on_screen_resize(current_width, current_height)
 
 
 if __name__ == "__main__":
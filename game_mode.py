@@ -13,6 +13,14 @@ class GameMode:
     def handle_event(self, event):
         pass
 
+    def changed_regions(self, screen):
+        """Screen rects this frame changes without any input.
+
+        None means the whole screen, which suits modes that animate; modes
+        that sit still between events return a list, often empty.
+        """
+        return None
+
     def get_screen_scale(self, screen):
         """Returns scale factor based on current screen size"""
         return min(screen.get_width()/WIDTH, screen.get_height()/HEIGHT)
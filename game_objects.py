@@ -1,4 +1,6 @@
+import itertools
 import time
+from collections import namedtuple
 import pygame
 from constants import *
 import math
@@ -7,7 +9,10 @@ from player_renderer import PlayerRenderer
 
 
 class GameObject:
+    ids = itertools.count()
+
     def __init__(self, x, y, radius):
+        self.id = next(GameObject.ids)  # Stable for the object's lifetime, unlike its list position
         self.x = x
         self.y = y
         self.radius = radius
@@ -18,41 +23,36 @@ class GameObject:
         screen_y = (self.y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
         return screen_x, screen_y
 
+    @staticmethod
+    def sprite_surface(extent):
+        """Transparent surface for a sprite reaching extent pixels from its centre"""
+        return pygame.Surface((2 * extent + 1, 2 * extent + 1), pygame.SRCALPHA)
+
 class MovableObject(GameObject):
     def __init__(self, x, y, radius, speed):
         super().__init__(x, y, radius)
         self.speed = speed
         self.dx = 0
         self.dy = 0
-        self.prev_x = x
-        self.prev_y = y
 
     def move(self, dx, dy):
         self.dx = dx * self.speed
         self.dy = dy * self.speed
-        self.prev_x = self.x
-        self.prev_y = self.y
         self.x += self.dx
         self.y += self.dy
 
-    def draw(self, screen, game, interpolation=None):
-        # Only interpolate if actually moving
-        if abs(self.dx) > 0 or abs(self.dy) > 0:
-            x = self.prev_x + (self.x - self.prev_x) * interpolation
-            y = self.prev_y + (self.y - self.prev_y) * interpolation
-        else:
-            x = self.x
-            y = self.y
-        
+    def draw(self, screen, game):
         # Convert world coordinates to screen coordinates
-        screen_x = (x - game.camera_x) * game.zoom
-        screen_y = (y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
+        screen_x = (self.x - game.camera_x) * game.zoom
+        screen_y = (self.y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
         
         # Scale the radius according to zoom
         scaled_radius = self.radius * game.zoom
         
         pygame.draw.circle(screen, self.color, (int(screen_x), int(screen_y)), int(scaled_radius))
 
+ParticleState = namedtuple('ParticleState', 'x y color')
+
 class Particle:
     def __init__(self, x, y, color):
         self.x = x
@@ -60,7 +60,6 @@ class Particle:
         self.color = list(color)  # Convert to list for alpha modification
         self.color.append(255)    # Add alpha channel
         self.birth_time = time.time()
-        self.base_size = PARTICLE_SIZE  # Store base size
 
     def update(self):
         age = time.time() - self.birth_time
@@ -71,28 +70,42 @@ class Particle:
         self.color[3] = max(0, 255 * (1 - age / PARTICLE_LIFETIME))
         return True
 
+    def state(self):
+        """Immutable copy of what draw_state needs"""
+        return ParticleState(self.x, self.y, tuple(self.color))
+
     def draw(self, screen, game):
-        if self.color[3] > 0:  # Only draw if not completely transparent
+        self.draw_state(screen, game, self.state())
+
+    @staticmethod
+    def draw_state(screen, game, state):
+        if state.color[3] > 0:  # Only draw if not completely transparent
             # Scale particle size with zoom
-            scaled_size = self.base_size * game.zoom
+            scaled_size = PARTICLE_SIZE * game.zoom
             
             # Create surface with scaled dimensions
             surface = pygame.Surface((scaled_size * 2, scaled_size * 2), pygame.SRCALPHA)
             
             # Draw scaled particle
-            pygame.draw.circle(surface, self.color, 
+            pygame.draw.circle(surface, state.color, 
                              (scaled_size, scaled_size), 
                              scaled_size)
             
             # Convert world coordinates to screen coordinates
-            screen_x = (self.x - game.camera_x) * game.zoom
-            screen_y = (self.y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
+            screen_x = (state.x - game.camera_x) * game.zoom
+            screen_y = (state.y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
             
             # Position the particle considering its scaled size
             screen.blit(surface, 
                        (int(screen_x - scaled_size), 
                         int(screen_y - scaled_size)))
 
+# Everything drawn about an actor at one moment, copied so that drawing
+# never reads the live object; `id` pairs states across ticks
+PlayerState = namedtuple('PlayerState', 'id x y radius color face_type hat_type trail_type trail_color')
+EnemyState = namedtuple('EnemyState', 'id x y radius color')
+StarState = namedtuple('StarState', 'x y radius')
+
 class Player(MovableObject):
     SYMBOL = 'S'
     def __init__(self, x, y, radius, speed, collision_checker, color=GOLD, face_type="happy", trail_color=PARTICLE_COLOR, hat_type="none", trail_type="none"):
@@ -105,31 +118,39 @@ class Player(MovableObject):
         self.hat_type = hat_type
         self.trail_type = trail_type
         self.particles = []
+        self.max_particles = None  # Set by the quality governor on slow machines
         self.last_particle_time = time.time()
         self.is_moving = False
 
-    def draw(self, screen, game, interpolated_x=None, interpolated_y=None):
+    def state(self):
+        """Immutable copy of what draw_state needs"""
+        return PlayerState(self.id, self.x, self.y, self.radius, self.color, self.face_type,
+                           self.hat_type, self.trail_type, self.trail_color)
+
+    def draw(self, screen, game):
+        self.draw_state(screen, game, self.state(), [particle.state() for particle in self.particles])
+
+    @staticmethod
+    def draw_state(screen, game, state, particles):
         # Draw particles first (behind player)
-        for particle in self.particles:
-            particle.draw(screen, game)
+        for particle in particles:
+            Particle.draw_state(screen, game, particle)
             
         # Calculate screen position
-        x = interpolated_x if interpolated_x is not None else self.x
-        y = interpolated_y if interpolated_y is not None else self.y
-        screen_x = (x - game.camera_x) * game.zoom
-        screen_y = (y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
+        screen_x = (state.x - game.camera_x) * game.zoom
+        screen_y = (state.y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
         
         # Use shared renderer
         PlayerRenderer.draw_player(
             screen=screen,
             pos=(screen_x, screen_y),
-            radius=self.radius,
-            color=self.color,
-            face_type=self.face_type,
-            hat_type=self.hat_type,
+            radius=state.radius,
+            color=state.color,
+            face_type=state.face_type,
+            hat_type=state.hat_type,
             scale=game.zoom,
-            trail_type=self.trail_type,
-            trail_color=self.trail_color
+            trail_type=state.trail_type,
+            trail_color=state.trail_color
         )
 
     def set_direction(self, direction):
@@ -148,7 +169,8 @@ class Player(MovableObject):
                 self.move(dx, dy)
                 # Add particles with custom trail color when moving
                 current_time = time.time()
-                if current_time - self.last_particle_time > 0.02:
+                if (current_time - self.last_particle_time > 0.02 and
+                        (self.max_particles is None or len(self.particles) < self.max_particles)):
                     self.particles.append(Particle(self.x, self.y, self.trail_color))
                     self.last_particle_time = current_time
             else:
@@ -167,19 +189,40 @@ class Coin(GameObject):
         self.radius = COIN_RADIUS
 
     def draw(self, screen, game):
+        self.draw_at(screen, game, self.x, self.y)
+
+    @classmethod
+    def draw_at(cls, screen, game, x, y):
+        """Draw a coin centred on (x, y); every coin looks the same"""
         # Convert world coordinates to screen coordinates
-        screen_x = (self.x - game.camera_x) * game.zoom
-        screen_y = (self.y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
-        scaled_radius = int(self.radius * game.zoom)
-        pygame.draw.circle(screen, COIN_COLOR, (int(screen_x), int(screen_y)), scaled_radius)
+        screen_x = (x - game.camera_x) * game.zoom
+        screen_y = (y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
+        scaled_radius = int(COIN_RADIUS * game.zoom)
+        game.sprite_cache.blit(screen, (int(screen_x), int(screen_y)), ('coin', scaled_radius),
+                               lambda: cls.bake(scaled_radius))
+
+    @classmethod
+    def bake(cls, scaled_radius):
+        sprite = cls.sprite_surface(scaled_radius)
+        pygame.draw.circle(sprite, COIN_COLOR, (scaled_radius, scaled_radius), scaled_radius)
+        return sprite
 
 class Enemy(GameObject):
     SYMBOL = 'E'
-    def __init__(self, x, y, radius, speed, find_path_func):
+    def __init__(self, x, y, radius, speed, find_path_func, path_worker=None, terrain_speed_func=None):
         super().__init__(x, y, radius)
         self.speed = speed
         self.find_path_func = find_path_func
+        self.path_worker = path_worker
+        self.terrain_speed_func = terrain_speed_func
+        self.path_request = None
+        self.intercept = False  # Aim for where the player is heading rather than where they are
         self.path = []
+        # While following a cooperative plan: ticks per plan step, ticks since
+        # the plan was made and the step at which path[0] is booked
+        self.step_ticks = None
+        self.plan_tick = 0
+        self.path_step = 0
         self.target = None
         self.color = RED
         self.dx = 0
@@ -190,38 +233,50 @@ class Enemy(GameObject):
             self.set_new_path(player_pos)
         self.move_along_path()
 
-    def draw(self, screen, game, interpolated_x=None, interpolated_y=None):
-        x = interpolated_x if interpolated_x is not None else self.x
-        y = interpolated_y if interpolated_y is not None else self.y
-        
+    def state(self):
+        """Immutable copy of what draw_state needs"""
+        return EnemyState(self.id, self.x, self.y, self.radius, self.color)
+
+    def draw(self, screen, game):
+        self.draw_state(screen, game, self.state())
+
+    @classmethod
+    def draw_state(cls, screen, game, state):
         # Convert world coordinates to screen coordinates
-        screen_x = (x - game.camera_x) * game.zoom
-        screen_y = (y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
-        scaled_radius = int(self.radius * game.zoom)
-        
+        screen_x = (state.x - game.camera_x) * game.zoom
+        screen_y = (state.y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
+        scaled_radius = int(state.radius * game.zoom)
+        game.sprite_cache.blit(screen, (int(screen_x), int(screen_y)), ('enemy', scaled_radius, state.color),
+                               lambda: cls.bake(scaled_radius, state.color))
+
+    @classmethod
+    def bake(cls, scaled_radius, color):
+        sprite = cls.sprite_surface(scaled_radius)
+        screen_x = screen_y = scaled_radius
+
         # Draw the main body
-        pygame.draw.circle(screen, self.color, (int(screen_x), int(screen_y)), scaled_radius)
+        pygame.draw.circle(sprite, color, (int(screen_x), int(screen_y)), scaled_radius)
         
         # Draw angry eyes
         eye_radius = max(2, scaled_radius // 5)
         eye_offset = scaled_radius // 3
-        pygame.draw.circle(screen, BLACK, 
+        pygame.draw.circle(sprite, BLACK, 
             (int(screen_x - eye_offset), int(screen_y - eye_offset)), 
             eye_radius)
-        pygame.draw.circle(screen, BLACK, 
+        pygame.draw.circle(sprite, BLACK, 
             (int(screen_x + eye_offset), int(screen_y - eye_offset)), 
             eye_radius)
         
         # Draw angry eyebrows
         eyebrow_length = scaled_radius // 2
         eyebrow_thickness = max(1, scaled_radius // 10)
-        pygame.draw.line(screen, BLACK, 
+        pygame.draw.line(sprite, BLACK, 
             (int(screen_x - eye_offset - eyebrow_length//2), 
              int(screen_y - eye_offset - eye_radius)),
             (int(screen_x - eye_offset + eyebrow_length//2), 
              int(screen_y - eye_offset - eye_radius - eyebrow_thickness)),
             eyebrow_thickness)
-        pygame.draw.line(screen, BLACK, 
+        pygame.draw.line(sprite, BLACK, 
             (int(screen_x + eye_offset - eyebrow_length//2), 
              int(screen_y - eye_offset - eye_radius - eyebrow_thickness)),
             (int(screen_x + eye_offset + eyebrow_length//2), 
@@ -237,16 +292,49 @@ class Enemy(GameObject):
             mouth_width,
             mouth_height
         )
-        pygame.draw.arc(screen, BLACK, mouth_rect, 3.14, 2 * 3.14, max(1, scaled_radius // 10))
+        pygame.draw.arc(sprite, BLACK, mouth_rect, 3.14, 2 * 3.14, max(1, scaled_radius // 10))
+        return sprite
+
+    def follow_plan(self, path, first_step, step_ticks):
+        """Follow planned cells, one per step of step_ticks; repeated cells are waits"""
+        self.path = path
+        self.path_step = first_step
+        self.step_ticks = step_ticks
+        self.plan_tick = 0
 
     def set_new_path(self, player_pos):
+        self.step_ticks = None
         start = (int(self.x // CELL_SIZE), int(self.y // CELL_SIZE))
         goal = (int(player_pos[0] // CELL_SIZE), int(player_pos[1] // CELL_SIZE))
-        self.path = self.find_path_func(start, goal)
+        if self.path_worker is None:
+            self.path = self.find_path_func(start, goal)
+        else:
+            self.path = self.poll_path_request(start, goal)
         if self.path:
             self.path.pop(0)  # Remove the starting position
 
+    def poll_path_request(self, start, goal):
+        """Collect a finished background search, or submit one for this goal"""
+        request = self.path_request
+        if request is not None and (request.start != start or self.path_worker.is_stale(request, goal)):
+            request.cancel()
+            request = None
+        if request is None:
+            self.path_request = self.path_worker.submit(start, goal)
+            return []
+        if not request.done():
+            return []
+        self.path_request = None
+        return request.result() or []
+
     def move_along_path(self):
+        if self.step_ticks is not None:
+            self.plan_tick += 1
+            # A cell is booked from its step on, so do not set off for it a step early
+            if self.plan_tick <= (self.path_step - 1) * self.step_ticks:
+                self.dx = 0
+                self.dy = 0
+                return
         if self.path:
             next_x, next_y = self.path[0]
             target_x = next_x * CELL_SIZE + CELL_SIZE // 2
@@ -256,14 +344,20 @@ class Enemy(GameObject):
             dy = target_y - self.y
             distance = ((dx ** 2) + (dy ** 2)) ** 0.5
 
-            if distance < self.speed:
+            # Mud slows the enemy down and conveyors speed it up
+            speed = self.speed
+            if self.terrain_speed_func:
+                speed *= self.terrain_speed_func(self.x, self.y)
+
+            if distance < speed:
                 self.x, self.y = target_x, target_y
                 self.path.pop(0)
+                self.path_step += 1
                 self.dx = 0  # Add this line
                 self.dy = 0  # Add this line
             else:
-                move_x = (dx / distance) * self.speed
-                move_y = (dy / distance) * self.speed
+                move_x = (dx / distance) * speed
+                move_y = (dy / distance) * speed
                 self.x += move_x
                 self.y += move_y
                 self.dx = move_x  # Add this line
@@ -274,14 +368,31 @@ class Star(GameObject):
     def __init__(self, x, y, radius):
         super().__init__(x, y, radius)
 
+    def state(self):
+        """Immutable copy of what draw_state needs"""
+        return StarState(self.x, self.y, self.radius)
+
     def draw(self, screen, game):
+        self.draw_state(screen, game, self.state())
+
+    @classmethod
+    def draw_state(cls, screen, game, state):
         # Convert world coordinates to screen coordinates
-        screen_x = (self.x - game.camera_x) * game.zoom
-        screen_y = (self.y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
-        scaled_radius = int(self.radius * game.zoom)
-        
+        screen_x = (state.x - game.camera_x) * game.zoom
+        screen_y = (state.y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
+        scaled_radius = int(state.radius * game.zoom)
+        game.sprite_cache.blit(screen, (int(screen_x), int(screen_y)), ('star', scaled_radius),
+                               lambda: cls.bake(scaled_radius))
+
+    @classmethod
+    def bake(cls, scaled_radius):
+        # The points reach 1.6 radii below the centre
+        extent = int(scaled_radius * 1.6) + 1
+        sprite = cls.sprite_surface(extent)
+        screen_x = screen_y = extent
+
         # Draw white background circle
-        pygame.draw.rect(screen, WHITE, (
+        pygame.draw.rect(sprite, WHITE, (
             int(screen_x - scaled_radius),
             int(screen_y - scaled_radius),
             scaled_radius * 2,
@@ -289,7 +400,7 @@ class Star(GameObject):
         ))
         
         # Draw star
-        pygame.draw.polygon(screen, GOLD, [
+        pygame.draw.polygon(sprite, GOLD, [
             (screen_x, screen_y - scaled_radius),
             (screen_x + scaled_radius * 0.3, screen_y + scaled_radius * 0.4),
             (screen_x + scaled_radius, screen_y + scaled_radius * 0.4),
@@ -301,6 +412,7 @@ class Star(GameObject):
             (screen_x - scaled_radius, screen_y + scaled_radius * 0.4),
             (screen_x - scaled_radius * 0.3, screen_y + scaled_radius * 0.4),
         ])
+        return sprite
 
 class Diamond(GameObject):
     SYMBOL = 'D'
@@ -310,13 +422,25 @@ class Diamond(GameObject):
         self.radius = CELL_SIZE // 2
 
     def draw(self, screen, game):
+        self.draw_at(screen, game, self.x, self.y)
+
+    @classmethod
+    def draw_at(cls, screen, game, x, y):
+        """Draw a diamond centred on (x, y); every diamond looks the same"""
         # Convert world coordinates to screen coordinates
-        screen_x = (self.x - game.camera_x) * game.zoom
-        screen_y = (self.y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
-        scaled_radius = int(self.radius * game.zoom)
-        
+        screen_x = (x - game.camera_x) * game.zoom
+        screen_y = (y - game.camera_y) * game.zoom + SCORE_AREA_HEIGHT
+        scaled_radius = int(CELL_SIZE // 2 * game.zoom)
+        game.sprite_cache.blit(screen, (int(screen_x), int(screen_y)), ('diamond', scaled_radius),
+                               lambda: cls.bake(scaled_radius))
+
+    @classmethod
+    def bake(cls, scaled_radius):
+        sprite = cls.sprite_surface(scaled_radius)
+        screen_x = screen_y = scaled_radius
+
         # Draw white background circle
-        pygame.draw.rect(screen, WHITE, (
+        pygame.draw.rect(sprite, WHITE, (
             int(screen_x - scaled_radius),
             int(screen_y - scaled_radius),
             scaled_radius * 2,
@@ -330,5 +454,6 @@ class Diamond(GameObject):
             (screen_x, screen_y + scaled_radius),
             (screen_x - scaled_radius, screen_y),
         ]
-        pygame.draw.polygon(screen, CYAN, points)
+        pygame.draw.polygon(sprite, CYAN, points)
+        return sprite
 
@@ -210,6 +210,7 @@ class CoolFace(SlotItem):
 class CircleTrail(SlotItem):
     def __init__(self):
         super().__init__("circles", "Circle Trail")
+        self.gradients = True  # The quality governor turns these off in play on slow machines
     
     def draw_preview(self, screen, pos, radius, scale=1.0, color=None):
         """Special preview rendering for shop tiles"""
@@ -251,12 +252,18 @@ class CircleTrail(SlotItem):
             
             particle_surface = pygame.Surface((particle_size * 2, particle_size * 2), pygame.SRCALPHA)
             
-            for r in range(int(particle_size), 0, -1):
-                current_opacity = int(opacity * (r / particle_size) * 0.8)
-                current_color = list(color or (135, 206, 235))
-                current_color.append(current_opacity)
-                pygame.draw.circle(particle_surface, current_color, 
-                                 (particle_size, particle_size), r)
+            if not self.gradients:
+                # One flat disc at the gradient's outer opacity
+                particle_color[3] = int(opacity * 0.8)
+                pygame.draw.circle(particle_surface, particle_color,
+                                 (particle_size, particle_size), particle_size)
+            else:
+                for r in range(int(particle_size), 0, -1):
+                    current_opacity = int(opacity * (r / particle_size) * 0.8)
+                    current_color = list(color or (135, 206, 235))
+                    current_color.append(current_opacity)
+                    pygame.draw.circle(particle_surface, current_color, 
+                                     (particle_size, particle_size), r)
             
             x_pos = start_x + ((2 - i) * (particle_spacing + particle_size))
             screen.blit(particle_surface, (x_pos, screen_y + 5))
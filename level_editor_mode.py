@@ -1,6 +1,7 @@
 import random
 import time
 import math
+import weakref
 
 import pygame
 import pygame.gfxdraw
@@ -9,34 +10,68 @@ from constants import *
 from game_objects import *
 from maze_utils import *
 from game_mode import GameMode
+from editor_history import EditHistory
+from reachability import ReachabilityMap
 
 
 from enum import Enum, auto
 
+# Number keys that pick the drawing tool
+TOOL_KEYS = {
+    pygame.K_1: "brush",
+    pygame.K_2: "line",
+    pygame.K_3: "rectangle",
+    pygame.K_4: "fill",
+}
+
 class LevelEditorMode(GameMode):
     def __init__(self, game, level_manager):
         super().__init__(game)
         self.level_manager = level_manager
         self.selected_item = ' '
+        self.tool = "brush"
         self.is_drawing = False
+        # Cell where the current drag started and the last cell it reached
+        self.drag_start = None
+        self.drag_cell = None
         self.show_help = False
-        self.font = pygame.font.Font(None, 36)
+        self.font = self.game.text_cache.font(36)
+        self.small_font = self.game.text_cache.font(24)
         # Store initial dimensions
         self.base_width = WIDTH
         self.base_height = HEIGHT
+        # Gradient background and the maze drawn over it, cached between frames.
+        # Edits repaint single cells; level switches, loads and resizes rebuild.
+        self.background = None
+        self.canvas = None
+        self.canvas_maze = None
+        self.canvas_terrain = None
+        self.canvas_view = None
+        # Top-left cell of the part of the level on screen
+        self.view_x = 0
+        self.view_y = 0
+        # Undo/redo history per level, dropped along with the level
+        self.histories = weakref.WeakKeyDictionary()
+        self.stroke_history = None
+        # Reachability overlay: distances from S, updated from the cells edited
+        # since the last frame, and the heatmap layer drawn from them
+        self.show_reachability = False
+        self.reachability = None
+        self.reachability_edits = []
+        self.heatmap = None
 
     def update(self):
         pass
 
-    def render(self, screen, interpolation):
-        screen_width, screen_height = screen.get_size()
-        
-        # Draw gradient background for full screen
-        for y in range(screen_height):
-            color = self.lerp_color(THEME_BACKGROUND, THEME_PRIMARY, y / screen_height)
-            pygame.draw.line(screen, color, (0, y), (screen_width, y))
+    def changed_regions(self, screen):
+        # Nothing here moves between events
+        return []
 
+    def render(self, screen, interpolation):
         self.draw_maze(screen)
+        if self.show_reachability:
+            self.draw_reachability(screen)
+        self.draw_tool_preview(screen)
         self.draw_ui(screen)
         if self.show_help:
             self.draw_help_overlay(screen)
@@ -44,10 +79,23 @@ class LevelEditorMode(GameMode):
     def draw_ui(self, screen):
         screen_width, screen_height = screen.get_size()
         
-        dev_text = self.font.render("Dev Mode: Press H for help", True, THEME_TEXT)
+        dev_text = self.font.render(f"Dev Mode: Press H for help - Tool: {self.tool}", True, THEME_TEXT)
         dev_rect = dev_text.get_rect(midtop=(screen_width // 2, 10))
         screen.blit(dev_text, dev_rect)
 
+        if self.show_reachability and self.level_manager.get_current_level().chunked:
+            status_text = self.small_font.render("Reachability overlay is off for chunked levels", True, THEME_TEXT)
+            screen.blit(status_text, status_text.get_rect(midtop=(screen_width // 2, dev_rect.bottom + 5)))
+        elif self.show_reachability and self.reachability is not None:
+            summary = self.reachability.summary()
+            enemies = ', '.join('unreachable' if d is None else str(d) for d in summary["enemy_distances"]) or 'none'
+            status = (f"Reachable {summary['reachable_cells']}/{summary['open_cells']} - "
+                      f"Unreachable pickups: {len(summary['unreachable_pickups'])} - "
+                      f"Enemies from start: {enemies}")
+            color = THEME_TEXT if not summary["unreachable_pickups"] else RED
+            status_text = self.small_font.render(status, True, color)
+            screen.blit(status_text, status_text.get_rect(midtop=(screen_width // 2, dev_rect.bottom + 5)))
+
         quit_text = self.font.render("Press ESC to return to menu", True, THEME_TEXT)
         quit_rect = quit_text.get_rect(midbottom=(screen_width // 2, screen_height - 10))
         screen.blit(quit_text, quit_rect)
@@ -68,7 +116,12 @@ class LevelEditorMode(GameMode):
             self.handle_mousemotion(event)
 
     def handle_keydown(self, event):
-        if event.key == pygame.K_p:
+        if event.mod & pygame.KMOD_CTRL and event.key in (pygame.K_z, pygame.K_y):
+            if event.key == pygame.K_y or event.mod & pygame.KMOD_SHIFT:
+                self.redo()
+            else:
+                self.undo()
+        elif event.key == pygame.K_p:
             self.selected_item = Player.SYMBOL
         elif event.key == pygame.K_e:
             self.selected_item = Enemy.SYMBOL
@@ -83,6 +136,12 @@ class LevelEditorMode(GameMode):
             self.selected_item = 'X'
         elif event.key == pygame.K_c:
             self.selected_item = ' '
+        elif event.key == pygame.K_u:
+            self.selected_item = TERRAIN_MUD
+        elif event.key == pygame.K_f:
+            self.selected_item = TERRAIN_CONVEYOR
+        elif event.key == pygame.K_g:
+            self.selected_item = TERRAIN_NORMAL
         elif event.key == pygame.K_SPACE:
             self.level_manager.save_levels_to_file()
             print(f"Level {self.level_manager.get_current_level().level_number} saved")
@@ -90,55 +149,236 @@ class LevelEditorMode(GameMode):
             self.level_manager.load_levels_from_file()
             print(f"Levels loaded from {self.level_manager.levels_file}")
         elif event.key == pygame.K_r:
-            self.level_manager.get_current_level().maze = [['X' for _ in range(MAZE_WIDTH)] for _ in range(MAZE_HEIGHT)]
+            self.erase_maze()
+        elif event.key == pygame.K_o:
+            self.show_reachability = not self.show_reachability
+        elif event.key in TOOL_KEYS:
+            self.end_stroke()
+            self.tool = TOOL_KEYS[event.key]
+        elif event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):
+            self.scroll_view(event.key)
         elif event.key == pygame.K_LEFTBRACKET:
             self.level_manager.prev_level()
         elif event.key == pygame.K_RIGHTBRACKET:
             self.level_manager.next_level()
 
-    def draw_maze(self, screen):
-        screen_width, screen_height = screen.get_size()
-        
+    def history(self):
+        current_level = self.level_manager.get_current_level()
+        history = self.histories.get(current_level)
+        if history is None:
+            history = self.histories[current_level] = EditHistory()
+        return history
+
+    def set_cell(self, layer, x, y, symbol, repaint=True):
+        """Write one cell of the maze or terrain layer, recording it in the history"""
+        grid = getattr(self.level_manager.get_current_level(), layer)
+        old = grid[y][x]
+        if old == symbol:
+            return
+        grid[y][x] = symbol
+        self.history().record(layer, x, y, old, symbol)
+        if layer == 'maze':
+            self.note_edits([(x, y)])
+        else:
+            self.level_manager.get_current_level().terrain_written(symbol)
+        if repaint:
+            self.repaint_cell(x, y)
+
+    def paint_spans(self, layer, spans, symbol):
+        """Set whole row spans (y, x0, x1) at once with slice assignment"""
+        grid = getattr(self.level_manager.get_current_level(), layer)
+        history = self.history()
+        for y, x0, x1 in spans:
+            row = grid[y]
+            history.record_span(layer, x0, y, row[x0:x1 + 1], symbol)
+            row[x0:x1 + 1] = symbol * (x1 + 1 - x0)
+        if layer == 'terrain' and spans:
+            self.level_manager.get_current_level().terrain_written(symbol)
+        self.spans_changed([(layer, y, x0, x1) for y, x0, x1 in spans])
+
+    def spans_changed(self, spans):
+        """Update the overlay and canvas after (layer, y, x0, x1) spans were written"""
+        # Spans can cover a whole level, so size them up before listing any cells
+        count = sum(x1 + 1 - x0 for layer, y, x0, x1 in spans)
+        if count > 64:
+            if any(layer == 'maze' for layer, y, x0, x1 in spans):
+                self.note_edits(None)
+            self.refresh_cells(None)
+            return
+        cells = [(layer, x, y) for layer, y, x0, x1 in spans for x in range(x0, x1 + 1)]
+        self.note_edits([(x, y) for layer, x, y in cells if layer == 'maze'])
+        self.refresh_cells((x, y) for layer, x, y in cells)
+
+    def refresh_cells(self, cells):
+        """Bring the canvas up to date after a batch of cell changes; None means too many to list"""
+        cells = list(cells) if cells is not None else None
+        # Past a few dozen cells one rebuild beats repainting each neighbourhood
+        if cells is None or len(cells) > 64:
+            self.invalidate_canvas()
+        else:
+            for x, y in cells:
+                self.repaint_cell(x, y)
+
+    def note_edits(self, cells):
+        """Queue edited maze cells for the reachability overlay's next update; None means too many"""
+        if self.reachability is None:
+            return
+        if cells is not None:
+            self.reachability_edits.extend(cells)
+        if cells is None or len(self.reachability_edits) > self.reachability.batch_limit:
+            # Too many to catch up on one by one; start over when next shown
+            self.reachability = None
+            self.reachability_edits = []
+
+    def erase_maze(self):
+        # Recorded as one stroke so R can be undone
+        current_level = self.level_manager.get_current_level()
+        spans = MazeUtils.rect_spans((0, 0), (current_level.width - 1, current_level.height - 1))
+        history = self.history()
+        history.begin_stroke('erase', pygame.time.get_ticks())
+        self.paint_spans('maze', spans, 'X')
+        self.paint_spans('terrain', spans, TERRAIN_NORMAL)
+        history.end_stroke(pygame.time.get_ticks())
+
+    def undo(self):
+        self.end_stroke()
+        self.apply_history(self.history().undo())
+
+    def redo(self):
+        self.end_stroke()
+        self.apply_history(self.history().redo())
+
+    def apply_history(self, spans):
+        current_level = self.level_manager.get_current_level()
+        for layer, y, x0, symbols in spans:
+            getattr(current_level, layer)[y][x0:x0 + len(symbols)] = symbols
+            if layer == 'terrain':
+                current_level.terrain_written(set(symbols))
+        self.spans_changed([(layer, y, x0, x0 + len(symbols) - 1) for layer, y, x0, symbols in spans])
+
+    def end_stroke(self):
+        self.is_drawing = False
+        self.drag_start = self.drag_cell = None
+        if self.stroke_history is not None:
+            # The level may have been switched mid-drag; close the stroke where it began
+            self.stroke_history.end_stroke(pygame.time.get_ticks())
+            self.stroke_history = None
+
+    def visible_cells(self):
+        """(x, y, width, height) of the cells on screen, with the view kept inside the level"""
+        current_level = self.level_manager.get_current_level()
+        view_width = min(current_level.width, EDITOR_VIEW_CELLS[0])
+        view_height = min(current_level.height, EDITOR_VIEW_CELLS[1])
+        self.view_x = max(0, min(self.view_x, current_level.width - view_width))
+        self.view_y = max(0, min(self.view_y, current_level.height - view_height))
+        return self.view_x, self.view_y, view_width, view_height
+
+    def scroll_view(self, key):
+        view_x, view_y, view_width, view_height = self.visible_cells()
+        dx, dy = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0),
+                  pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}[key]
+        # A quarter of the view per press
+        self.view_x += dx * max(1, view_width // 4)
+        self.view_y += dy * max(1, view_height // 4)
+
+    def maze_layout(self, screen_width, screen_height):
+        """Cell size and top-left offset of the maze for a screen size"""
         # Calculate scaling factors
         scale = min(screen_width / self.base_width, (screen_height - SCORE_AREA_HEIGHT) / (self.base_height - SCORE_AREA_HEIGHT))
-        scaled_cell_size = CELL_SIZE * scale
+        view_x, view_y, view_width, view_height = self.visible_cells()
+        # Views larger than the default maze shrink their cells to fit the same area
+        scaled_cell_size = CELL_SIZE * scale * min(1, MAZE_WIDTH / view_width, MAZE_HEIGHT / view_height)
         
         # Recalculate offset to center the maze
-        offset_x = (screen_width - MAZE_WIDTH * scaled_cell_size) // 2
+        offset_x = (screen_width - view_width * scaled_cell_size) // 2
         offset_y = SCORE_AREA_HEIGHT * scale
+        return scaled_cell_size, offset_x, offset_y
+
+    def cell_rect(self, x, y):
+        scaled_cell_size, offset_x, offset_y = self.layout
+        x -= self.view_x
+        y -= self.view_y
+        # Add 1 pixel to width and height to eliminate gaps
+        return pygame.Rect(
+            int(x * scaled_cell_size + offset_x),
+            int(y * scaled_cell_size + offset_y),
+            int(scaled_cell_size + 1),  # Add 1 to overlap with next cell
+            int(scaled_cell_size + 1)   # Add 1 to overlap with next cell
+        )
+
+    def draw_maze(self, screen):
+        current_level = self.level_manager.get_current_level()
+        if (self.canvas is None or self.canvas.get_size() != screen.get_size() or
+                self.canvas_maze is not current_level.maze or
+                self.canvas_terrain is not current_level.terrain or
+                self.canvas_view != self.visible_cells()):
+            self.rebuild_canvas(screen.get_size())
+        screen.blit(self.canvas, (0, 0))
+
+    def rebuild_canvas(self, screen_size):
+        screen_width, screen_height = screen_size
+        if self.background is None or self.background.get_size() != screen_size:
+            # Draw gradient background for full screen
+            self.background = pygame.Surface(screen_size).convert()
+            for y in range(screen_height):
+                color = self.lerp_color(THEME_BACKGROUND, THEME_PRIMARY, y / screen_height)
+                pygame.draw.line(self.background, color, (0, y), (screen_width, y))
+
+        current_level = self.level_manager.get_current_level()
+        self.canvas = self.background.copy()
+        self.canvas_maze = current_level.maze
+        self.canvas_terrain = current_level.terrain
+        self.layout = self.maze_layout(screen_width, screen_height)
+        self.canvas_view = view_x, view_y, view_width, view_height = self.visible_cells()
+        for y in range(view_y, view_y + view_height):
+            for x in range(view_x, view_x + view_width):
+                self.draw_maze_cell(x, y)
+
+    def invalidate_canvas(self):
+        """Force a full rebuild, for edits that touch too many cells to repaint one by one"""
+        self.canvas = None
+
+    def repaint_cell(self, x, y):
+        """Redraw one edited cell on the cached canvas"""
+        if self.canvas is None:
+            return
+        view_x, view_y, view_width, view_height = self.canvas_view
+        if not (view_x <= x < view_x + view_width and view_y <= y < view_y + view_height):
+            return
+        # Neighbouring cells overlap this one by a pixel, so redraw them too,
+        # in the original order, clipped to this cell
+        self.canvas.set_clip(self.cell_rect(x, y))
+        for cell_y in range(max(view_y, y - 1), min(view_y + view_height, y + 2)):
+            for cell_x in range(max(view_x, x - 1), min(view_x + view_width, x + 2)):
+                self.draw_maze_cell(cell_x, cell_y)
+        self.canvas.set_clip(None)
+
+    def draw_maze_cell(self, x, y):
+        current_level = self.level_manager.get_current_level()
+        cell = current_level.maze[y][x]
+        rect = self.cell_rect(x, y)
+        if cell == 'X':
+            pygame.draw.rect(self.canvas, BLACK, rect)
+        elif cell == ' ':
+            pygame.draw.rect(self.canvas, TERRAIN_COLORS.get(current_level.terrain[y][x], WHITE), rect)
+        elif cell == 'S':
+            pygame.draw.rect(self.canvas, LIGHT_BROWN, rect)
+        elif cell == 'E':
+            pygame.draw.rect(self.canvas, RED, rect)
+        elif cell == '*':
+            pygame.draw.rect(self.canvas, GOLD, rect)
+        elif cell == 'D':
+            pygame.draw.rect(self.canvas, CYAN, rect)
         
-        current_maze = self.level_manager.get_current_level().maze
-        for y, row in enumerate(current_maze):
-            for x, cell in enumerate(row):
-                # Add 1 pixel to width and height to eliminate gaps
-                rect = pygame.Rect(
-                    int(x * scaled_cell_size + offset_x),
-                    int(y * scaled_cell_size + offset_y),
-                    int(scaled_cell_size + 1),  # Add 1 to overlap with next cell
-                    int(scaled_cell_size + 1)   # Add 1 to overlap with next cell
-                )
-                if cell == 'X':
-                    pygame.draw.rect(screen, BLACK, rect)
-                elif cell == ' ':
-                    pygame.draw.rect(screen, WHITE, rect)
-                elif cell == 'S':
-                    pygame.draw.rect(screen, LIGHT_BROWN, rect)
-                elif cell == 'E':
-                    pygame.draw.rect(screen, RED, rect)
-                elif cell == '*':
-                    pygame.draw.rect(screen, GOLD, rect)
-                elif cell == 'D':
-                    pygame.draw.rect(screen, CYAN, rect)
-                
-                # Draw grid lines
-                pygame.draw.rect(screen, (128, 128, 128), rect, 1)  # Gray color, 1 pixel width
+        # Draw grid lines
+        pygame.draw.rect(self.canvas, (128, 128, 128), rect, 1)  # Gray color, 1 pixel width
 
     def draw_help_overlay(self, screen):
-        screen_width, screen_height = screen.get_size()
-        
-        overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-        overlay.fill((*THEME_BACKGROUND[:3], 200))
-        screen.blit(overlay, (0, 0))
+        # The help text never changes, so it is baked into a cached overlay
+        self.game.overlays.blit(screen, "editor_help", (*THEME_BACKGROUND[:3], 200), self.draw_help_text)
+
+    def draw_help_text(self, overlay):
+        screen_width, screen_height = overlay.get_size()
 
         help_text = [
             "Dev Mode Hotkeys:",
@@ -148,9 +388,17 @@ class LevelEditorMode(GameMode):
             "M - Place Diamond",
             "W - Place Wall",
             "C - Clear/Empty cell",
+            "U - Paint mud (slow)",
+            "F - Paint conveyor (fast)",
+            "G - Paint plain ground",
             "SPACE - Save maze",
             "L - Load maze",
             "R - Erase entire maze",
+            "Ctrl+Z - Undo",
+            "Ctrl+Y / Ctrl+Shift+Z - Redo",
+            "1 - Brush  2 - Line  3 - Rectangle  4 - Fill",
+            "Arrow keys - Scroll levels larger than the screen",
+            "O - Toggle reachability overlay",
             "ESC - Exit Dev Mode",
             "",
             "Level Management:",
@@ -159,49 +407,152 @@ class LevelEditorMode(GameMode):
             "[ - Previous level",
             "] - Next level",
             "",
-            "Click and drag to draw",
+            "Click and drag to draw with the current tool",
             "",
             "Press H to close this help"
         ]
 
         y_offset = screen_height * 0.1  # Start at 10% of screen height
-        line_spacing = screen_height * 0.04  # 4% of screen height between lines
+        # 4% of screen height between lines, tighter if the list would run off screen
+        line_spacing = min(screen_height * 0.04, screen_height * 0.85 / len(help_text))
         for line in help_text:
             text_surface = self.font.render(line, True, THEME_TEXT)
             text_rect = text_surface.get_rect(center=(screen_width // 2, y_offset))
-            screen.blit(text_surface, text_rect)
+            overlay.blit(text_surface, text_rect)
             y_offset += line_spacing
 
     def handle_mousebuttondown(self, event):
         if event.button == 1:
+            self.end_stroke()
+            cell = self.cell_at(event.pos)
+            if cell is None:
+                return
             self.is_drawing = True
-            self.draw_cell(event.pos)
+            self.drag_start = self.drag_cell = cell
+            # Every tool operation, from press to release, is one undo step
+            self.stroke_history = self.history()
+            self.stroke_history.begin_stroke((self.tool, self.selected_item), pygame.time.get_ticks())
+            if self.tool == "brush":
+                self.draw_cell(cell)
+            elif self.tool == "fill":
+                self.fill_region(cell)
 
     def handle_mousebuttonup(self, event):
-        if event.button == 1:
-            self.is_drawing = False
+        if event.button == 1 and self.is_drawing:
+            end = self.cell_at(event.pos, clamp=True)
+            if self.tool == "line":
+                for cell in MazeUtils.line_cells(self.drag_start, end):
+                    self.draw_cell(cell)
+            elif self.tool == "rectangle":
+                self.paint_spans(self.paint_layer(), MazeUtils.rect_spans(self.drag_start, end), self.selected_item)
+            self.end_stroke()
 
     def handle_mousemotion(self, event):
-        if self.is_drawing:
-            self.draw_cell(event.pos)
+        if not self.is_drawing:
+            return
+        cell = self.cell_at(event.pos, clamp=True)
+        if cell != self.drag_cell:
+            # The brush, the drag preview and the overlay status can all change
+            self.game.dirty.mark_all()
+        if self.tool == "brush":
+            # Fast drags jump several cells between events, so join them with a line
+            for line_cell in MazeUtils.line_cells(self.drag_cell, cell)[1:]:
+                self.draw_cell(line_cell)
+        self.drag_cell = cell
 
-    def draw_cell(self, pos):
-        screen_width, screen_height = self.game.screen.get_size()
-        scale = min(screen_width / self.base_width, (screen_height - SCORE_AREA_HEIGHT) / (self.base_height - SCORE_AREA_HEIGHT))
-        scaled_cell_size = CELL_SIZE * scale
-        
-        # Calculate new offsets
-        offset_x = (screen_width - MAZE_WIDTH * scaled_cell_size) // 2
-        offset_y = SCORE_AREA_HEIGHT * scale
+    def cell_at(self, pos, clamp=False):
+        """Maze cell under a screen position, or None outside the maze unless clamped"""
+        scaled_cell_size, offset_x, offset_y = self.maze_layout(*self.game.screen.get_size())
         
+        view_x, view_y, view_width, view_height = self.visible_cells()
         x, y = pos
         cell_x = int((x - offset_x) // scaled_cell_size)
         cell_y = int((y - offset_y) // scaled_cell_size)
         
-        if 0 <= cell_x < MAZE_WIDTH and 0 <= cell_y < MAZE_HEIGHT:
-            self.level_manager.get_current_level().maze[cell_y][cell_x] = self.selected_item
+        if clamp:
+            return (view_x + min(max(cell_x, 0), view_width - 1),
+                    view_y + min(max(cell_y, 0), view_height - 1))
+        if 0 <= cell_x < view_width and 0 <= cell_y < view_height:
+            return view_x + cell_x, view_y + cell_y
+        return None
+
+    def paint_layer(self):
+        # Terrain symbols paint the cost layer and leave the maze cell alone
+        return 'terrain' if self.selected_item in TERRAIN_COSTS else 'maze'
+
+    def draw_cell(self, cell):
+        self.set_cell(self.paint_layer(), *cell, self.selected_item)
+
+    def fill_region(self, cell):
+        layer = self.paint_layer()
+        grid = getattr(self.level_manager.get_current_level(), layer)
+        if grid[cell[1]][cell[0]] != self.selected_item:
+            self.paint_spans(layer, MazeUtils.flood_spans(grid, cell), self.selected_item)
+
+    def draw_reachability(self, screen):
+        current_level = self.level_manager.get_current_level()
+        if current_level.chunked:
+            # A whole-level distance grid is what chunked storage exists to avoid
+            self.reachability = None
+            self.reachability_edits = []
+            return
+        if self.reachability is None or self.reachability.maze is not current_level.maze:
+            self.reachability = ReachabilityMap(current_level.maze)
+            self.reachability_edits = []
+            self.heatmap = None
+        elif self.reachability_edits:
+            changed = self.reachability.update(self.reachability_edits)
+            self.reachability_edits = []
+            if changed is None:
+                self.heatmap = None
+            elif self.heatmap is not None:
+                view_x, view_y, view_width, view_height = self.heatmap_view
+                for x, y in changed:
+                    if view_x <= x < view_x + view_width and view_y <= y < view_y + view_height:
+                        self.draw_heat_cell(x, y)
+
+        if (self.heatmap is None or self.heatmap.get_size() != screen.get_size() or
+                self.heatmap_layout != self.layout or self.heatmap_view != self.canvas_view):
+            self.heatmap = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            self.heatmap_layout = self.layout
+            self.heatmap_view = view_x, view_y, view_width, view_height = self.canvas_view
+            for y in range(view_y, view_y + view_height):
+                for x in range(view_x, view_x + view_width):
+                    self.draw_heat_cell(x, y)
+        screen.blit(self.heatmap, (0, 0))
+
+    def draw_heat_cell(self, x, y):
+        """Colour one cell of the heatmap by its distance from the start"""
+        scaled_cell_size, offset_x, offset_y = self.layout
+        column, row = x - self.view_x, y - self.view_y
+        # Exact cell bounds, without the overlap used by the maze canvas
+        left, top = int(column * scaled_cell_size + offset_x), int(row * scaled_cell_size + offset_y)
+        rect = pygame.Rect(left, top,
+                           int((column + 1) * scaled_cell_size + offset_x) - left,
+                           int((row + 1) * scaled_cell_size + offset_y) - top)
+        distance = self.reachability.distances[y][x]
+        if distance is not None:
+            t = min(1, distance / (self.reachability.width + self.reachability.height))
+            self.heatmap.fill(self.lerp_color(HEATMAP_NEAR_COLOR, HEATMAP_FAR_COLOR, t), rect)
+        elif self.reachability.passable(x, y):
+            self.heatmap.fill(UNREACHABLE_COLOR, rect)
+        else:
+            self.heatmap.fill((0, 0, 0, 0), rect)
+
+    def draw_tool_preview(self, screen):
+        """Outline the cells a line or rectangle drag will paint on release"""
+        if not self.is_drawing or self.tool not in ("line", "rectangle"):
+            return
+        if self.tool == "line":
+            for cell in MazeUtils.line_cells(self.drag_start, self.drag_cell):
+                pygame.draw.rect(screen, THEME_SECONDARY, self.cell_rect(*cell), 2)
+        else:
+            corner_a = self.cell_rect(*self.drag_start)
+            corner_b = self.cell_rect(*self.drag_cell)
+            pygame.draw.rect(screen, THEME_SECONDARY, corner_a.union(corner_b), 2)
 
     def on_screen_resize(self, screen_width, screen_height):
         """Handle screen resize events"""
         scale = self.get_screen_scale(self.game.screen)
-        self.font = pygame.font.Font(None, int(36 * scale))
+        self.font = self.game.text_cache.font(int(36 * scale))
+        self.small_font = self.game.text_cache.font(int(24 * scale))
@@ -1,6 +1,7 @@
 import json
 import os
-from constants import MAZE_WIDTH, MAZE_HEIGHT
+from constants import MAZE_WIDTH, MAZE_HEIGHT, TERRAIN_NORMAL, CHUNKED_LEVEL_CELLS
+from chunked_grid import ChunkedGrid
 
 class LevelManager:
     def __init__(self, levels_file):
@@ -19,7 +20,7 @@ class LevelManager:
         try:
             with open(self.levels_file, 'r') as f:
                 levels_data = json.load(f)
-            self.levels = [Level(level_data["maze"], level_data["level_number"], level_data.get("title", "")) for level_data in levels_data]
+            self.levels = [Level(level_data["maze"], level_data["level_number"], level_data.get("title", ""), level_data.get("terrain")) for level_data in levels_data]
             if self.levels and not self.levels[0].title:
                 self.levels[0].title = "The Zig Zag"
             if len(self.levels) > 1 and not self.levels[1].title:
@@ -32,15 +33,21 @@ class LevelManager:
             print(f"Error parsing {self.levels_file}. Generating a default level.")
             self.generate_default_level()
 
-    def generate_default_level(self):
-        default_maze = [['X' for _ in range(MAZE_WIDTH)] for _ in range(MAZE_HEIGHT)]
+    def generate_default_level(self, width=MAZE_WIDTH, height=MAZE_HEIGHT):
+        default_maze = ['X' * width] * height
         default_level = Level(default_maze, 1, "Default Level")
         self.levels = [default_level]
         self.current_level_index = 0
         print("Default level generated.")
 
     def save_levels_to_file(self):
-        levels_data = [{"maze": level.maze, "level_number": level.level_number, "title": level.title} for level in self.levels]
+        levels_data = []
+        for level in self.levels:
+            level_data = {"maze": level.maze_rows(), "level_number": level.level_number, "title": level.title}
+            if level.has_weighted_terrain():
+                # Only levels that use mud or conveyors carry the extra layer
+                level_data["terrain"] = level.terrain_rows()
+            levels_data.append(level_data)
         with open(self.levels_file, 'w') as f:
             json.dump(levels_data, f)
         print(f"Levels saved to {self.levels_file}")
@@ -56,20 +63,65 @@ class LevelManager:
         self.current_level_index = (self.current_level_index - 1) % len(self.levels)
         return self.get_current_level()
 
-    def new_level(self):
+    def new_level(self, width=MAZE_WIDTH, height=MAZE_HEIGHT):
         # Create an empty maze (walls around the edges, empty inside)
-        new_maze = [['X' for _ in range(MAZE_WIDTH)] for _ in range(MAZE_HEIGHT)]
-        for y in range(1, MAZE_HEIGHT-1):
-            for x in range(1, MAZE_WIDTH-1):
-                new_maze[y][x] = ' '
-                
+        new_maze = ['X' * width] + ['X' + ' ' * (width - 2) + 'X'] * (height - 2) + ['X' * width]
+
         new_level = Level(new_maze, len(self.levels) + 1, f"Level {len(self.levels) + 1}")
         self.levels.append(new_level)
         self.current_level_index = len(self.levels) - 1
         return self.get_current_level()
 
 class Level:
-    def __init__(self, maze, level_number, title=""):
-        self.maze = maze
+    def __init__(self, maze, level_number, title="", terrain=None):
+        self.width = len(maze[0])
+        self.height = len(maze)
         self.level_number = level_number
-        self.title = title
\ No newline at end of file
+        self.title = title
+        # Huge levels live in compressed chunks; the rest stay plain nested lists
+        self.chunked = self.width * self.height > CHUNKED_LEVEL_CELLS
+        if self.chunked:
+            self.maze = ChunkedGrid.from_rows(maze, 'X')
+        else:
+            self.maze = [list(row) for row in maze]
+        # Per-cell traversal cost layer, one TERRAIN_COSTS symbol per maze cell
+        if terrain is None:
+            terrain = [TERRAIN_NORMAL * self.width] * self.height
+        if self.chunked:
+            self.terrain = ChunkedGrid.from_rows(terrain, TERRAIN_NORMAL)
+        else:
+            self.terrain = [list(row) for row in terrain]
+        # Whether any cell costs more or less than normal; None until counted
+        self.weighted = None
+
+    def maze_rows(self):
+        """The maze for saving: nested lists as before, or row strings for chunked levels"""
+        if self.chunked:
+            return list(self.maze.rows())
+        return self.maze
+
+    def terrain_rows(self):
+        if self.chunked:
+            return list(self.terrain.rows())
+        return [''.join(row) for row in self.terrain]
+
+    def has_weighted_terrain(self):
+        # Scanning decodes every chunk of a huge level, so count once and keep it
+        if self.weighted is None:
+            if self.chunked:
+                self.weighted = self.terrain.count(TERRAIN_NORMAL) < self.width * self.height
+            else:
+                self.weighted = any(cell != TERRAIN_NORMAL for row in self.terrain for cell in row)
+        return self.weighted
+
+    def terrain_written(self, symbols):
+        """Keep has_weighted_terrain() right after the editor writes these terrain symbols"""
+        if any(symbol != TERRAIN_NORMAL for symbol in symbols):
+            self.weighted = True
+        elif self.weighted:
+            # This may have cleared the last weighted cell; count again when asked
+            self.weighted = None
+
+    def path_terrain(self):
+        """The terrain layer for pathfinding, or None when every step costs the same"""
+        return self.terrain if self.has_weighted_terrain() else None
\ No newline at end of file
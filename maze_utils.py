@@ -1,34 +1,363 @@
-import heapq
+import random
+import re
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
 from constants import *
 
+try:
+    import numpy as np
+except ImportError:  # Distance tables fall back to a flat array('H')
+    np = None
+
 
 class MazeUtils:
     @staticmethod
     def check_collision(maze, x, y, radius):
+        width, height = len(maze[0]), len(maze)
         for dy in [-1, 0, 1]:
             for dx in [-1, 0, 1]:
                 cell_x = int((x + dx * radius) // CELL_SIZE)
                 cell_y = int((y + dy * radius) // CELL_SIZE)
-                if (cell_x < 0 or cell_x >= MAZE_WIDTH or
-                    cell_y < 0 or cell_y >= MAZE_HEIGHT or
+                if (cell_x < 0 or cell_x >= width or
+                    cell_y < 0 or cell_y >= height or
                     maze[cell_y][cell_x] == 'X'):
                     return True
         return False
 
     @staticmethod
-    def find_path(maze, start, goal):
+    def find_cells(maze, symbol):
+        """(x, y) of every cell holding symbol, in reading order"""
+        if hasattr(maze, 'positions'):
+            # Chunked mazes search their chunk bytes instead of walking every cell
+            return maze.positions(symbol)
+        return [(x, y) for y, row in enumerate(maze) for x, cell in enumerate(row) if cell == symbol]
+
+    @staticmethod
+    def random_cell(maze, symbol):
+        """A random cell holding symbol, or None; chunked mazes only look until they find one"""
+        if hasattr(maze, 'random_position'):
+            return maze.random_position(symbol)
+        cells = MazeUtils.find_cells(maze, symbol)
+        return random.choice(cells) if cells else None
+
+    @staticmethod
+    def count_cells(maze, symbol):
+        if hasattr(maze, 'positions'):
+            return maze.count(symbol)
+        return sum(row.count(symbol) for row in maze)
+
+    @staticmethod
+    def find_path(maze, start, goal, terrain=None, max_nodes=None):
+        astar = AStar(maze, terrain)
+        path = astar.find_path(start, goal, max_nodes)
+        return path
+
+    @staticmethod
+    def distance_field(maze, goal):
+        """Breadth-first step counts from every reachable cell to goal"""
+        astar = AStar(maze)
+        distances = {goal: 0}
+        frontier = deque([goal])
+        while frontier:
+            current = frontier.popleft()
+            next_distance = distances[current] + 1
+            for next in astar.get_neighbors(current):
+                if next not in distances:
+                    distances[next] = next_distance
+                    frontier.append(next)
+        return distances
+
+    @staticmethod
+    def line_cells(start, end):
+        """Cells on the Bresenham line from start to end, both included"""
+        (x0, y0), (x1, y1) = start, end
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        step_x = 1 if x0 < x1 else -1
+        step_y = 1 if y0 < y1 else -1
+        error = dx + dy
+        cells = [(x0, y0)]
+        while (x0, y0) != (x1, y1):
+            doubled = 2 * error
+            if doubled >= dy:
+                error += dy
+                x0 += step_x
+            if doubled <= dx:
+                error += dx
+                y0 += step_y
+            cells.append((x0, y0))
+        return cells
+
+    @staticmethod
+    def rect_spans(start, end):
+        """Row spans (y, x0, x1) of the filled rectangle between two corner cells"""
+        x0, x1 = sorted((start[0], end[0]))
+        y0, y1 = sorted((start[1], end[1]))
+        return [(y, x0, x1) for y in range(y0, y1 + 1)]
+
+    @staticmethod
+    def flood_spans(grid, start):
+        """Row spans (y, x0, x1) of the region of equal cells 4-connected to start"""
+        x, y = start
+        target = grid[y][x]
+        height = len(grid)
+        run_pattern = re.compile(re.escape(target) + '+')
+        # Runs of target cells per row, found once per row with one regex scan
+        runs = {}
+
+        def row_runs(y):
+            if y not in runs:
+                found = [match.span() for match in run_pattern.finditer(''.join(grid[y]))]
+                runs[y] = ([end - 1 for begin, end in found], found)
+            return runs[y]
+
+        ends, found = row_runs(y)
+        stack = [(y, bisect_left(ends, x))]
+        seen = set(stack)
+        spans = []
+        while stack:
+            y, index = stack.pop()
+            x0, x1 = runs[y][1][index]
+            x1 -= 1
+            spans.append((y, x0, x1))
+            # Every run above and below that overlaps this one joins the region
+            for next_y in (y - 1, y + 1):
+                if not 0 <= next_y < height:
+                    continue
+                next_ends, next_found = row_runs(next_y)
+                next_index = bisect_left(next_ends, x0)
+                while next_index < len(next_found) and next_found[next_index][0] <= x1:
+                    if (next_y, next_index) not in seen:
+                        seen.add((next_y, next_index))
+                        stack.append((next_y, next_index))
+                    next_index += 1
+        return spans
+
+    @staticmethod
+    def maze_key(maze):
+        """Hashable snapshot of a maze, used to cache per-maze data"""
+        return tuple(''.join(row) for row in maze)
+
+    @staticmethod
+    def distance_table(maze):
+        """All-pairs step distances for a maze, cached by its contents"""
+        key = MazeUtils.maze_key(maze)
+        table = _distance_tables.get(key)
+        if table is None:
+            table = DistanceTable(key)
+            _distance_tables[key] = table
+            if len(_distance_tables) > DISTANCE_TABLE_CACHE_SIZE:
+                _distance_tables.popitem(last=False)
+        else:
+            _distance_tables.move_to_end(key)
+        return table
+
+
+_distance_tables = OrderedDict()
+
+
+class DistanceTable:
+    """Shortest step counts between every pair of walkable cells.
+
+    Distances live in one uint16 matrix indexed by walkable cell only, so a
+    query is an index lookup plus a matrix lookup. Unreachable pairs hold
+    UNREACHABLE. With NumPy the searches from every cell run together as
+    whole-matrix bit operations, and a second matrix stores which neighbour
+    each cell steps to next on the way to every other cell.
+    """
+    UNREACHABLE = 0xFFFF
+    NO_HOP = 0xFF
+
+    def __init__(self, maze):
+        self.width = len(maze[0])
+        self.height = len(maze)
+        self.cells = [(x, y) for y, row in enumerate(maze)
+                      for x, cell in enumerate(row) if cell != 'X']
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
         astar = AStar(maze)
-        path = astar.find_path(start, goal)
+        self.neighbors = [[self.index[next] for next in astar.get_neighbors(cell)]
+                          for cell in self.cells]
+
+        count = len(self.cells)
+        self.count = count
+        if np is not None:
+            self.matrix = self.fill_matrix()
+            self.distances = self.matrix.reshape(-1)
+            self.hops = self.fill_hops().reshape(-1)
+        else:
+            self.matrix = None
+            self.hops = None
+            self.distances = array('H', [self.UNREACHABLE]) * (count * count)
+            for source in range(count):
+                self.fill_row(source)
+
+    def neighbor_array(self):
+        """Neighbour indices per cell, padded to four with the index one past the last cell"""
+        padded = np.full((self.count, 4), self.count, dtype=np.intp)
+        for i, neighbors in enumerate(self.neighbors):
+            padded[i, :len(neighbors)] = neighbors
+        return padded
+
+    def fill_matrix(self):
+        # Breadth-first search from every cell at once. Row c is a bitset of
+        # the sources whose search has reached cell c, and each distance is
+        # written in binary, one bit plane per power of two.
+        count = self.count
+        neighbors = self.neighbor_array()
+        reached = np.packbits(np.eye(count, dtype=bool), axis=1)
+        # The extra all-zero row stands in for missing neighbours
+        frontier = np.vstack([reached, np.zeros((1, reached.shape[1]), dtype=np.uint8)])
+        planes = []
+        distance = 0
+        while True:
+            distance += 1
+            new = frontier[neighbors[:, 0]]
+            for k in range(1, 4):
+                new |= frontier[neighbors[:, k]]
+            new &= ~reached
+            if not new.any():
+                break
+            reached |= new
+            frontier[:count] = new
+            for bit in range(distance.bit_length()):
+                if distance >> bit & 1:
+                    if bit == len(planes):
+                        planes.append(np.zeros_like(reached))
+                    planes[bit] |= new
+
+        matrix = np.zeros((count, count), dtype=np.uint16)
+        for bit, plane in enumerate(planes):
+            matrix |= np.unpackbits(plane, axis=1, count=count).astype(np.uint16) << bit
+        matrix[np.unpackbits(reached, axis=1, count=count) == 0] = self.UNREACHABLE
+        # Steps are symmetric, so row c (searches that reached c) is also c's own row
+        return matrix
+
+    def fill_hops(self):
+        """Slot in neighbors[i] of the first step from cell i towards every cell j"""
+        neighbors = self.neighbor_array()
+        padded = np.vstack([self.matrix, np.full((1, self.count), self.UNREACHABLE, dtype=np.uint16)])
+        closer = self.matrix - np.uint16(1)  # Wraps on the diagonal, which never has a next step
+        hops = np.full((self.count, self.count), self.NO_HOP, dtype=np.uint8)
+        for k in range(4):
+            step = (padded[neighbors[:, k]] == closer) & (hops == self.NO_HOP)
+            hops[step] = k
+        return hops
+
+    def fill_row(self, source):
+        # Plain breadth-first search; the maze is unweighted
+        row = [self.UNREACHABLE] * self.count
+        row[source] = 0
+        frontier = [source]
+        distance = 0
+        neighbors = self.neighbors
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for current in frontier:
+                for next in neighbors[current]:
+                    if row[next] == self.UNREACHABLE:
+                        row[next] = distance
+                        next_frontier.append(next)
+            frontier = next_frontier
+        start = source * self.count
+        self.distances[start:start + self.count] = (
+            np.array(row, dtype=np.uint16) if np is not None else array('H', row))
+
+    def distance(self, a, b):
+        """Steps from cell a to cell b, or None if either is a wall or unreachable"""
+        i = self.index.get(a)
+        j = self.index.get(b)
+        if i is None or j is None:
+            return None
+        distance = self.distances[i * self.count + j]
+        return None if distance == self.UNREACHABLE else int(distance)
+
+    def distances_to(self, goal):
+        """Map of every cell that can reach goal to its distance"""
+        j = self.index.get(goal)
+        if j is None:
+            return {}
+        column = self.distances[j::self.count]
+        return {cell: int(distance) for cell, distance in zip(self.cells, column)
+                if distance != self.UNREACHABLE}
+
+    def next_step(self, a, b):
+        """The neighbour of a that is one step closer to b, or None"""
+        i = self.index.get(a)
+        j = self.index.get(b)
+        if i is None or j is None or i == j:
+            return None
+        count = self.count
+        if self.hops is not None:
+            hop = self.hops[i * count + j]
+            return None if hop == self.NO_HOP else self.cells[self.neighbors[i][hop]]
+        distance = self.distances[i * count + j]
+        if distance == self.UNREACHABLE:
+            return None
+        for next in self.neighbors[i]:
+            if self.distances[next * count + j] == distance - 1:
+                return self.cells[next]
+        return None
+
+    def find_path(self, start, goal):
+        """Same result shape as AStar.find_path, built by walking next_step"""
+        if self.distance(start, goal) is None:
+            return None
+        path = [start]
+        current = start
+        while current != goal:
+            current = self.next_step(current, goal)
+            path.append(current)
         return path
 
+class BucketQueue:
+    """Priority queue for small non-negative integer priorities.
+
+    Items sit in one bucket per priority and pops scan forward from the
+    lowest non-empty bucket. Path costs here only ever grow by a few units
+    per step, so this beats a binary heap of tuples.
+    """
+    def __init__(self):
+        self.buckets = []
+        self.lowest = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, priority, item):
+        if priority >= len(self.buckets):
+            self.buckets.extend([] for _ in range(priority + 1 - len(self.buckets)))
+        self.buckets[priority].append(item)
+        if priority < self.lowest:
+            self.lowest = priority
+        self.size += 1
+
+    def pop(self):
+        buckets = self.buckets
+        while not buckets[self.lowest]:
+            self.lowest += 1
+        self.size -= 1
+        return self.lowest, buckets[self.lowest].pop()
+
 class AStar:
-    def __init__(self, maze):
+    """A* over the maze grid; with a terrain layer, each step costs its cell's weight"""
+    def __init__(self, maze, terrain=None):
         self.maze = maze
+        self.terrain = terrain
         self.width = len(maze[0])
         self.height = len(maze)
+        # Scale the heuristic by the cheapest step so it never overestimates
+        self.min_cost = min(TERRAIN_COSTS.values()) if terrain is not None else 1
 
     def heuristic(self, a, b):
-        return abs(b[0] - a[0]) + abs(b[1] - a[1])
+        return (abs(b[0] - a[0]) + abs(b[1] - a[1])) * self.min_cost
+
+    def step_cost(self, node):
+        if self.terrain is None:
+            return 1
+        x, y = node
+        return TERRAIN_COSTS[self.terrain[y][x]]
 
     def get_neighbors(self, node):
         x, y = node
@@ -39,24 +368,37 @@ class AStar:
                 neighbors.append((nx, ny))
         return neighbors
 
-    def find_path(self, start, goal):
-        frontier = []
-        heapq.heappush(frontier, (0, start))
+    def find_path(self, start, goal, max_nodes=None):
+        """Cheapest path from start to goal, or None if there is none.
+
+        With max_nodes, the search gives up after expanding that many cells
+        and returns the path to the expanded cell nearest the goal instead.
+        """
+        frontier = BucketQueue()
+        frontier.push(0, start)
         came_from = {start: None}
         cost_so_far = {start: 0}
+        expanded = 0
+        nearest = start
 
         while frontier:
-            current = heapq.heappop(frontier)[1]
+            current = frontier.pop()[1]
 
             if current == goal:
                 break
+            expanded += 1
+            if self.heuristic(goal, current) < self.heuristic(goal, nearest):
+                nearest = current
+            if max_nodes is not None and expanded >= max_nodes:
+                goal = nearest
+                break
 
             for next in self.get_neighbors(current):
-                new_cost = cost_so_far[current] + 1
+                new_cost = cost_so_far[current] + self.step_cost(next)
                 if next not in cost_so_far or new_cost < cost_so_far[next]:
                     cost_so_far[next] = new_cost
                     priority = new_cost + self.heuristic(goal, next)
-                    heapq.heappush(frontier, (priority, next))
+                    frontier.push(priority, next)
                     came_from[next] = current
 
         if goal not in came_from:
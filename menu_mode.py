@@ -64,29 +64,45 @@ class MenuMode(GameMode):
         self.title_bounce = 0
         self.title_bounce_speed = 3
         self.title_bounce_height = 10
+        # Screen areas the title bounce and selection pulse cover, from the last render
+        self.animated_rects = None
         
         # Stats display
         self.show_stats = True
         self.stats_alpha = 0
         self.stats_fade_speed = 5
         
-        # Add background image loading after other initializations
+        # Load the background image off the main thread; it is converted once it arrives
+        self.background = None
+        # Scaled and dimmed background, rebuilt only when the window size changes
+        self.backdrop = None
         background_path = os.path.join("assets", "background.png")
+        self.background_task = game.startup.submit("background.png", pygame.image.load, background_path)
+
+    def poll_background(self):
+        if self.background_task is None or not self.background_task.done():
+            return
+        task, self.background_task = self.background_task, None
         try:
-            self.background = pygame.image.load(background_path).convert()
-        except pygame.error as e:
+            self.background = task.result().convert()
+        except (pygame.error, OSError) as e:
             print(f"Warning: Could not load background image: {e}")
-            self.background = None
+        # Rebuild the backdrop with the image on the next render
+        self.backdrop = None
 
     def update_fonts(self, screen):
         """Update font sizes based on screen dimensions"""
         scale = self.get_screen_scale(screen)
-        self.title_font = pygame.font.Font(None, int(self.title_font_size * scale))
-        self.font = pygame.font.Font(None, int(self.menu_font_size * scale))
-        self.small_font = pygame.font.Font(None, int(self.small_font_size * scale))
+        self.title_font = self.game.text_cache.font(int(self.title_font_size * scale))
+        self.font = self.game.text_cache.font(int(self.menu_font_size * scale))
+        self.small_font = self.game.text_cache.font(int(self.small_font_size * scale))
 
     def update(self):
-        # Update menu animations
+        self.poll_background()
+
+        # Update menu animations; they hold still under the help overlay
+        if self.show_help_overlay:
+            return
         self.animation_offset = (self.animation_offset + self.animation_speed) % (2 * math.pi)
         self.title_bounce = math.sin(pygame.time.get_ticks() / 500) * self.title_bounce_height
         
@@ -96,15 +112,14 @@ class MenuMode(GameMode):
         else:
             self.stats_alpha = max(0, self.stats_alpha - self.stats_fade_speed)
 
-    def render(self, screen, interpolation):
-        # Update fonts for current screen size
-        self.update_fonts(screen)
-        
-        screen_width = screen.get_width()
-        screen_height = screen.get_height()
-        scale = self.get_screen_scale(screen)
-        
-        # Draw background with dimming effect
+    def on_screen_resize(self, screen_width, screen_height):
+        """Handle screen resize events"""
+        self.update_fonts(self.game.screen)
+        self.build_backdrop(screen_width, screen_height)
+
+    def build_backdrop(self, screen_width, screen_height):
+        """Scale the background and composite the dimming overlay once per window size"""
+        backdrop = pygame.Surface((screen_width, screen_height)).convert()
         if self.background:
             # Calculate scaling to fit width while maintaining aspect ratio
             bg_aspect_ratio = self.background.get_width() / self.background.get_height()
@@ -120,17 +135,30 @@ class MenuMode(GameMode):
             dark_overlay = pygame.Surface((screen_width, screen_height))
             dark_overlay.fill((0, 0, 0))  # Black overlay
             
-            # Fill screen with black first to cover any gaps
-            screen.fill((0, 0, 0))
+            # Fill with black first to cover any gaps
+            backdrop.fill((0, 0, 0))
             
             # Draw background centered
-            screen.blit(scaled_background, (0, y_offset))
+            backdrop.blit(scaled_background, (0, y_offset))
             
             # Apply overlay
             dark_overlay.set_alpha(128)
-            screen.blit(dark_overlay, (0, 0))
+            backdrop.blit(dark_overlay, (0, 0))
         else:
-            screen.fill(THEME_BACKGROUND)
+            backdrop.fill(THEME_BACKGROUND)
+        self.backdrop = backdrop
+
+    def render(self, screen, interpolation):
+        screen_width = screen.get_width()
+        screen_height = screen.get_height()
+        scale = self.get_screen_scale(screen)
+        
+        # The window may have changed size while another mode was showing
+        if self.backdrop is None or self.backdrop.get_size() != screen.get_size():
+            self.on_screen_resize(screen_width, screen_height)
+        
+        # Static backdrop first; animated elements draw on top
+        screen.blit(self.backdrop, (0, 0))
         
         # Draw animated title with bounce effect - adjust for screen size
         title = self.title_font.render("Labyrinth Runner", True, THEME_TEXT)
@@ -143,6 +171,12 @@ class MenuMode(GameMode):
                                         True, THEME_SECONDARY)
         subtitle_rect = subtitle.get_rect(midtop=(screen_width//2, title_rect.bottom + 20))
         screen.blit(subtitle, subtitle_rect)
+
+        # The title and subtitle move together through the whole bounce range
+        bounce_top = (50 - self.title_bounce_height) * screen_height/HEIGHT
+        bounce_range = 2 * self.title_bounce_height * screen_height/HEIGHT
+        self.animated_rects = [pygame.Rect(0, bounce_top - 1, screen_width,
+                                           subtitle_rect.bottom - title_rect.top + bounce_range + 2)]
         
         # Calculate spacing based on screen height
         total_buttons = len(self.buttons)
@@ -164,6 +198,7 @@ class MenuMode(GameMode):
                 pygame.draw.rect(screen, THEME_SECONDARY, 
                                button_rect.inflate(padding * 2, padding),
                                border_radius=5)
+                self.animated_rects.append(button_rect.inflate(32, 17))
                 
                 # Draw description
                 desc = self.small_font.render(button["description"], True, THEME_TEXT_SECONDARY)
@@ -178,9 +213,11 @@ class MenuMode(GameMode):
         
         # Draw current level and high score at bottom
         stats_text = [
-            f"Current Level: {self.game.level_manager.get_current_level().level_number}/{len(self.game.level_manager.levels)}",
             f"High Score: {max(self.game.level_scores.values()) if self.game.level_scores else 0}"
         ]
+        # Levels may still be loading during the first frames
+        if self.game.levels_ready():
+            stats_text.insert(0, f"Current Level: {self.game.level_manager.get_current_level().level_number}/{len(self.game.level_manager.levels)}")
         
         y_pos = screen_height - 60
         for text in stats_text:
@@ -189,19 +226,26 @@ class MenuMode(GameMode):
             screen.blit(text_surface, text_rect)
             y_pos += 25
 
+    def changed_regions(self, screen):
+        if self.show_help_overlay:
+            return []
+        if self.animated_rects is None:
+            return None
+        # Background loading can change the stats line at the bottom
+        return self.animated_rects + [pygame.Rect(0, screen.get_height() - 75, screen.get_width(), 55)]
+
     def draw_help_overlay(self, screen):
-        screen_width = screen.get_width()
-        screen_height = screen.get_height()
-        
-        # Create semi-transparent overlay
-        overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
+        # Semi-transparent overlay with the help text baked in, cached per screen size
+        self.game.overlays.blit(screen, "menu_help", (0, 0, 0, 200), self.draw_help_text)
+
+    def draw_help_text(self, overlay):
+        screen_width = overlay.get_width()
+        screen_height = overlay.get_height()
 
         # Help title
         help_title = self.font.render("Game Controls", True, THEME_TEXT)
         title_rect = help_title.get_rect(midtop=(screen_width//2, screen_height//4))
-        screen.blit(help_title, title_rect)
+        overlay.blit(help_title, title_rect)
 
         # Help instructions
         instructions = [
@@ -227,7 +271,7 @@ class MenuMode(GameMode):
                 continue
             text = self.small_font.render(instruction, True, THEME_TEXT)
             text_rect = text.get_rect(midtop=(screen_width//2, y_pos))
-            screen.blit(text, text_rect)
+            overlay.blit(text, text_rect)
             y_pos += spacing
 
     def handle_event(self, event):
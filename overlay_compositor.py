@@ -0,0 +1,38 @@
+from collections import OrderedDict
+
+import pygame
+from constants import OVERLAY_CACHE_SIZE
+
+
+class OverlayCompositor:
+    """Caches full-screen translucent overlays with their static text baked in.
+
+    Each overlay is built once per (key, screen size) by filling a panel
+    and calling draw_static on it, then reused until the window changes
+    size. Only content that changes, such as a countdown digit, still has
+    to be drawn every frame.
+    """
+    def __init__(self, max_layers=OVERLAY_CACHE_SIZE):
+        self.max_layers = max_layers
+        self.layers = OrderedDict()
+
+    def layer(self, key, size, color, draw_static=None):
+        cache_key = (key, size, tuple(color))
+        layer = self.layers.get(cache_key)
+        if layer is None:
+            layer = pygame.Surface(size, pygame.SRCALPHA)
+            layer.fill(color)
+            if draw_static:
+                draw_static(layer)
+            self.layers[cache_key] = layer
+            if len(self.layers) > self.max_layers:
+                self.layers.popitem(last=False)
+        else:
+            self.layers.move_to_end(cache_key)
+        return layer
+
+    def blit(self, screen, key, color, draw_static=None):
+        screen.blit(self.layer(key, screen.get_size(), color, draw_static), (0, 0))
+
+    def clear(self):
+        self.layers.clear()
@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from constants import PATH_SEARCH_MAX_NODES
+from maze_utils import MazeUtils, AStar
+
+
+# The maze snapshot searches run against, loaded once per level into
+# whichever thread or process does the work
+_snapshot = None
+
+
+def load_snapshot(grid, terrain):
+    global _snapshot
+    _snapshot = (grid, terrain)
+
+
+def search_path(start, goal):
+    """Runs a single bounded A* search; module level so process workers can pickle it"""
+    grid, terrain = _snapshot
+    return AStar(grid, terrain).find_path(start, goal, PATH_SEARCH_MAX_NODES)
+
+
+def build_distance_table():
+    """Builds, or fetches from this worker's cache, the all-pairs table for the snapshot"""
+    return MazeUtils.distance_table(_snapshot[0])
+
+
+def snapshot_grid(grid):
+    """Read-only copy of a grid: chunked ones share their compressed chunks, the rest become row strings"""
+    if grid is None:
+        return None
+    if hasattr(grid, 'snapshot'):
+        return grid.snapshot()
+    return tuple(''.join(row) for row in grid)
+
+
+class PathRequest:
+    """A path search submitted to the worker, tagged with what it was asked for"""
+    def __init__(self, future, start, goal, maze_version):
+        self.future = future
+        self.start = start
+        self.goal = goal
+        self.maze_version = maze_version
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        return self.future.result()
+
+    def cancel(self):
+        self.future.cancel()
+
+
+class PathWorker:
+    """Runs path searches off the main loop against a read-only maze snapshot.
+
+    Searches run on a worker thread or process. The snapshot is handed over
+    once per set_maze(), so requests only carry their start and goal.
+    Callers submit a request and poll it on later ticks; results for an old
+    goal or an old maze version are reported as stale so they can be thrown
+    away.
+    """
+    def __init__(self, kind="thread"):
+        self.kind = kind
+        if kind == "process":
+            self.executor = ProcessPoolExecutor(max_workers=1)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="path_worker")
+        self.maze_version = 0
+
+    def set_maze(self, maze, terrain=None):
+        """Take a fresh snapshot of the maze; pending results become stale"""
+        # The single worker runs tasks in order, so every later search sees this snapshot
+        self.executor.submit(load_snapshot, snapshot_grid(maze), snapshot_grid(terrain))
+        self.maze_version += 1
+
+    def submit(self, start, goal):
+        future = self.executor.submit(search_path, start, goal)
+        return PathRequest(future, start, goal, self.maze_version)
+
+    def submit_distance_table(self):
+        """Future for the distance table of the current snapshot"""
+        return self.executor.submit(build_distance_table)
+
+    def is_stale(self, request, goal):
+        return request.goal != goal or request.maze_version != self.maze_version
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
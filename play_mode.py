@@ -9,6 +9,13 @@ from constants import *
 from game_objects import *
 from maze_utils import *
 from game_mode import GameMode
+from path_worker import PathWorker, snapshot_grid
+from spatial_grid import SpatialGrid
+from cooperative_planner import CooperativePlanner
+from coin_field import CoinField
+from world_layer import WorldLayer
+from world_snapshot import SnapshotBuffer, CameraState, RenderCamera, StaticWorld, TakenCells
+from items import ITEMS
 
 
 from enum import Enum, auto
@@ -35,17 +42,49 @@ class PlayMode(GameMode):
         self.level_start_time = 0
         self.LEVEL_START_DELAY = LEVEL_START_DELAY  # Use constant instead of magic number
         self.remaining_time = 0
+        # State and countdown shown by the last render, and where the countdown was drawn
+        self.shown_state = None
+        self.shown_countdown = None
+        self.countdown_rect = None
+        # Optional background worker for enemy path searches
+        self.path_worker = PathWorker(PATH_WORKER) if PATH_WORKER else None
+        self.enemies = []
+        # Broadphase for enemy-versus-player checks
+        self.enemy_grid = SpatialGrid(CELL_SIZE)
+        # Maze, coins and diamonds pre-rendered around the camera; only
+        # rendering touches it, from the snapshot's world and taken cells
+        self.world_layer = WorldLayer()
+        self.world = None
+        self.taken = None
+        self.taken_this_tick = []
+        # What the last two ticks left behind; rendering only reads these
+        self.snapshots = SnapshotBuffer()
+        # Shared planner used when more than one enemy is chasing
+        self.planner = None
+        self.ticks_until_replan = 0
+        # All-pairs distances for the current level, when it is small enough,
+        # and the worker's build of them while it runs
+        self.distance_table = None
+        self.pending_table = None
+
+    def shutdown(self):
+        if self.path_worker:
+            self.path_worker.shutdown()
 
     def update_fonts(self, screen):
         """Update font sizes based on screen dimensions"""
         scale = self.get_screen_scale(screen)
-        self.title_font = pygame.font.Font(None, int(self.title_font_size * scale))
-        self.font = pygame.font.Font(None, int(self.normal_font_size * scale))
-        self.small_font = pygame.font.Font(None, int(self.small_font_size * scale))
+        self.title_font = self.game.text_cache.font(int(self.title_font_size * scale))
+        self.font = self.game.text_cache.font(int(self.normal_font_size * scale))
+        self.small_font = self.game.text_cache.font(int(self.small_font_size * scale))
 
     def on_screen_resize(self, screen_width, screen_height):
         """Handle screen resize events"""
         self.update_fonts(self.game.screen)
+        if self.player:
+            # The published camera was framed for the old viewport
+            self.snapshots.reset()
+            self.publish_snapshot()
 
     def start_level(self):
         current_level = self.level_manager.get_current_level()
@@ -56,7 +95,7 @@ class PlayMode(GameMode):
             start_pos = (CELL_SIZE * 1.5, CELL_SIZE * 1.5)
         
         # Get customization settings
-        customization_mode = self.game.modes["runner_customization"]
+        customization_mode = self.game.get_mode("runner_customization")
         player_color = customization_mode.get_player_color()
         player_face = customization_mode.get_player_face()
         trail_color = customization_mode.get_trail_color()
@@ -74,36 +113,44 @@ class PlayMode(GameMode):
             trail_color=trail_color,
             hat_type=hat_type
         )
+        self.player.max_particles = self.game.quality["particle_cap"]
         
         # Reset all game objects
-        self.enemy = self.create_enemy()
+        self.enemies = self.create_enemies()
         self.star = self.create_star()
         self.diamonds = self.create_diamonds()
         self.coins = self.create_coins(0)
+        self.capture_world()
         self.score = 0
         self.state = GameState.LEVEL_START
         self.level_start_time = pygame.time.get_ticks()
+        self.snapshots.reset()
+        self.publish_snapshot()
 
     def find_start_position(self, maze):
         """Find the starting position marked with 'S' in the maze"""
-        for y, row in enumerate(maze):
-            for x, cell in enumerate(row):
-                if cell == 'S':
-                    return (x * CELL_SIZE + CELL_SIZE // 2, y * CELL_SIZE + CELL_SIZE // 2)
+        cells = MazeUtils.find_cells(maze, 'S')
+        if cells:
+            x, y = cells[0]
+            return (x * CELL_SIZE + CELL_SIZE // 2, y * CELL_SIZE + CELL_SIZE // 2)
         return None
 
     def get_current_maze(self):
         return self.level_manager.get_current_level().maze
 
     def init_game_objects(self):
-        player_color = self.game.modes["runner_customization"].get_player_color()
+        player_color = self.game.get_mode("runner_customization").get_player_color()
         self.player = self.create_player(player_color)
-        self.enemy = self.create_enemy()
+        self.player.max_particles = self.game.quality["particle_cap"]
+        self.enemies = self.create_enemies()
         self.star = self.create_star()
         self.diamonds = self.create_diamonds()
         self.coins = self.create_coins(0)
+        self.capture_world()
         self.score = 0
         self.state = GameState.PLAYING
+        self.snapshots.reset()
+        self.publish_snapshot()
 
     def update(self):
         if self.player is None:
@@ -111,8 +158,12 @@ class PlayMode(GameMode):
             
         current_time = pygame.time.get_ticks()
         
+        self.adopt_distance_table()
+
         # Update camera position to follow player
+        self.game.update_zoom()
         self.update_camera()
+        self.keep_chunks_resident()
         
         if self.state == GameState.LEVEL_START:
             self.remaining_time = max(0, (self.level_start_time + self.LEVEL_START_DELAY - current_time) // 1000)
@@ -120,8 +171,11 @@ class PlayMode(GameMode):
                 self.state = GameState.PLAYING
         elif self.state == GameState.PLAYING:
             self.player.update()
-            if self.enemy:
-                self.enemy.update((self.player.x, self.player.y))
+            player_pos = (self.player.x, self.player.y)
+            intercept_pos = self.cell_center(self.predict_player_cell())
+            self.replan_enemies()
+            for enemy in self.enemies:
+                enemy.update(intercept_pos if enemy.intercept else player_pos)
             self.collect_coins()
             self.check_enemy_collision()
             self.check_level_complete()
@@ -131,28 +185,52 @@ class PlayMode(GameMode):
             pass  # Maybe add a game over animation or countdown here
         elif self.state == GameState.LEVEL_COMPLETE:
             pass  # Maybe add a level complete animation here
+        self.publish_snapshot()
+
+    def publish_snapshot(self):
+        """Hand the state at the end of this tick, camera and pickups included, to the renderer"""
+        self.update_camera()
+        game = self.game
+        camera = CameraState(game.camera_x, game.camera_y, game.zoom, game.target_zoom,
+                             game.viewport_width, game.viewport_height, game.render_scale)
+        if self.taken_this_tick:
+            self.taken = TakenCells(tuple(self.taken_this_tick), self.taken)
+            self.taken_this_tick = []
+        self.snapshots.publish(camera, self.world, self.taken, self.score, self.state, self.remaining_time,
+                               self.player, self.enemies,
+                               [particle.state() for particle in self.player.particles], self.star)
+
+    def frame_view(self, interpolation):
+        """Snapshot to draw this frame and the camera to draw it with; nothing live is touched"""
+        view = self.snapshots.view(interpolation)
+        if view is None:
+            return None, None
+        return view, RenderCamera(*view.camera, self.game.sprite_cache)
 
     def render(self, screen, interpolation):
         screen.fill((0, 0, 0))
+        view, camera = self.frame_view(interpolation)
+        if view is None:
+            return
         
         # Draw the base game elements
-        self.render_game_elements(screen, interpolation)
+        self.render_game_elements(screen, view, camera)
         
         # Draw state-specific overlay
-        self.render_state_overlay(screen)
+        self.render_state_overlay(screen, view)
         
         # Always draw UI on top
-        self.draw_ui(screen)
+        self.draw_ui(screen, view)
 
-    def render_game_elements(self, screen, interpolation):
+    def render_game_elements(self, screen, view, camera):
         screen.fill((0, 0, 0))
-        self.render_maze(screen)
-        self.render_game_objects(screen, interpolation)
-        self.draw_score_area(screen)
+        self.render_maze(screen, view, camera)
+        self.render_game_objects(screen, view, camera)
+        self.draw_score_area(screen, view)
 
-    def render_ui_elements(self, screen):
-        self.draw_score_area(screen)
-        self.draw_ui(screen)
+    def render_ui_elements(self, screen, view):
+        self.draw_score_area(screen, view)
+        self.draw_ui(screen, view)
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -172,32 +250,89 @@ class PlayMode(GameMode):
         
         # Add zoom controls
         if event.type == pygame.MOUSEWHEEL:
-            # Zoom in/out with mouse wheel
-            self.game.target_zoom = max(0.5, min(2.0, self.game.target_zoom + event.y * 0.1))
+            # Zoom in/out with mouse wheel; update() eases the camera there
+            # Zoom is in screen pixels, so its limits follow the render resolution
+            scale = self.game.render_scale
+            self.game.target_zoom = max(ZOOM_MIN * scale, min(ZOOM_MAX * scale,
+                                                              self.game.target_zoom + event.y * ZOOM_STEP * scale))
 
     def check_collision(self, x, y, radius):
         return MazeUtils.check_collision(self.get_current_maze(), x, y, radius)
 
     def find_path(self, start, goal):
-        return MazeUtils.find_path(self.get_current_maze(), start, goal)
+        if self.distance_table is not None:
+            return self.distance_table.find_path(start, goal)
+        current_level = self.level_manager.get_current_level()
+        return MazeUtils.find_path(current_level.maze, start, goal, current_level.path_terrain(),
+                                   PATH_SEARCH_MAX_NODES)
+
+    def terrain_speed(self, x, y):
+        """Speed multiplier for the terrain under a world position"""
+        terrain = self.level_manager.get_current_level().terrain
+        cost = TERRAIN_COSTS[terrain[int(y // CELL_SIZE)][int(x // CELL_SIZE)]]
+        return TERRAIN_COSTS[TERRAIN_NORMAL] / cost
+
+    def uses_distance_table(self, maze):
+        # The table counts steps, so it only answers paths when every step costs the same
+        current_level = self.level_manager.get_current_level()
+        if current_level.has_weighted_terrain():
+            return False
+        walkable = current_level.width * current_level.height - MazeUtils.count_cells(maze, 'X')
+        return walkable <= DISTANCE_TABLE_MAX_CELLS
+
+    def build_distance_table(self, maze):
+        return MazeUtils.distance_table(maze) if self.uses_distance_table(maze) else None
+
+    def adopt_distance_table(self):
+        """Switch enemies to table lookups once the worker has built the table"""
+        if self.pending_table is None or not self.pending_table.done():
+            return
+        self.distance_table = self.pending_table.result()
+        self.pending_table = None
+        if self.planner:
+            self.planner.distance_table = self.distance_table
+        for enemy in self.enemies:
+            if enemy.path_request is not None:
+                enemy.path_request.cancel()
+                enemy.path_request = None
+            enemy.path_worker = None
+
+    def player_cell(self):
+        return (int(self.player.x // CELL_SIZE), int(self.player.y // CELL_SIZE))
+
+    @staticmethod
+    def cell_center(cell):
+        return (cell[0] * CELL_SIZE + CELL_SIZE // 2, cell[1] * CELL_SIZE + CELL_SIZE // 2)
+
+    def predict_player_cell(self):
+        """Where the player will be after a few more cells in their current direction"""
+        cell = self.player_cell()
+        if self.distance_table is None or not self.player.direction:
+            return cell
+        dx, dy = self.player.direction
+        for _ in range(INTERCEPT_LOOKAHEAD):
+            next = (cell[0] + dx, cell[1] + dy)
+            if next not in self.distance_table.index:
+                break
+            cell = next
+        return cell
 
     def create_game_object(self, object_class, *args):
         current_maze = self.get_current_maze()
-        for y, row in enumerate(current_maze):
-            for x, cell in enumerate(row):
-                if cell == object_class.SYMBOL:
-                    # Center the object in the cell
-                    obj_x = x * CELL_SIZE + (CELL_SIZE // 2)
-                    obj_y = y * CELL_SIZE + (CELL_SIZE // 2)
-                    if object_class in [Player, Enemy]:
-                        return object_class(obj_x, obj_y, *args)
-                    else:
-                        return object_class(obj_x, obj_y, *args)
+        cells = MazeUtils.find_cells(current_maze, object_class.SYMBOL)
+        if cells:
+            x, y = cells[0]
+            # Center the object in the cell
+            obj_x = x * CELL_SIZE + (CELL_SIZE // 2)
+            obj_y = y * CELL_SIZE + (CELL_SIZE // 2)
+            if object_class in [Player, Enemy]:
+                return object_class(obj_x, obj_y, *args)
+            else:
+                return object_class(obj_x, obj_y, *args)
         
-        empty_cells = [(x, y) for y, row in enumerate(current_maze) 
-                       for x, cell in enumerate(row) if cell == ' ']
-        if empty_cells:
-            x, y = random.choice(empty_cells)
+        empty_cell = MazeUtils.random_cell(current_maze, ' ')
+        if empty_cell:
+            x, y = empty_cell
             # Center the object in the cell
             obj_x = x * CELL_SIZE + (CELL_SIZE // 2)
             obj_y = y * CELL_SIZE + (CELL_SIZE // 2)
@@ -209,7 +344,7 @@ class PlayMode(GameMode):
         return None
 
     def create_player(self, color):
-        customization_mode = self.game.modes["runner_customization"]
+        customization_mode = self.game.get_mode("runner_customization")
         player = self.create_game_object(
             Player, 
             PLAYER_RADIUS, 
@@ -224,52 +359,105 @@ class PlayMode(GameMode):
         return player
 
     def create_coins(self, num_coins):
-        coins = []
+        # One coin per empty cell, built a chunk at a time as the player gets near
+        return CoinField(self.get_current_maze())
+
+    def create_enemies(self):
+        """Spawn one enemy for every 'E' cell in the maze"""
         current_maze = self.get_current_maze()
-        for y, row in enumerate(current_maze):
-            for x, cell in enumerate(row):
-                if cell == ' ':
-                    # Center the coin in the cell
-                    coin_x = x * CELL_SIZE + (CELL_SIZE // 2)
-                    coin_y = y * CELL_SIZE + (CELL_SIZE // 2)
-                    coins.append(Coin(coin_x, coin_y))
-        return coins
-
-    def create_enemy(self):
-        enemy = self.create_game_object(Enemy, CELL_SIZE // 2 - 1, ENEMY_SPEED, self.find_path)
-        if enemy is None:
+        self.distance_table = None
+        if self.pending_table is not None:
+            self.pending_table.cancel()
+            self.pending_table = None
+        if self.path_worker:
+            # New level state, so give the worker a fresh read-only copy of the maze
+            self.path_worker.set_maze(current_maze, self.level_manager.get_current_level().path_terrain())
+            if self.uses_distance_table(current_maze):
+                # Building the table takes a moment; enemies search on the worker until it is done
+                self.pending_table = self.path_worker.submit_distance_table()
+        else:
+            self.distance_table = self.build_distance_table(current_maze)
+        enemies = [self.create_enemy(x, y) for x, y in MazeUtils.find_cells(current_maze, Enemy.SYMBOL)]
+
+        if not enemies:
             # If no 'E' symbol found, place the enemy at a random empty cell
-            empty_cells = [(x, y) for y, row in enumerate(self.get_current_maze()) 
-                           for x, cell in enumerate(row) if cell == ' ']
-            if empty_cells:
-                x, y = random.choice(empty_cells)
-                # Center the enemy in the cell
-                enemy_x = x * CELL_SIZE + (CELL_SIZE // 2)
-                enemy_y = y * CELL_SIZE + (CELL_SIZE // 2)
-                enemy = Enemy(enemy_x, enemy_y, 
-                              CELL_SIZE // 2 - 1, ENEMY_SPEED, self.find_path)
-        return enemy
+            empty_cell = MazeUtils.random_cell(current_maze, ' ')
+            if empty_cell:
+                enemies.append(self.create_enemy(*empty_cell))
+
+        # With company, every other enemy cuts the player off instead of chasing
+        for i, enemy in enumerate(enemies):
+            enemy.intercept = i % 2 == 1
+
+        # Planning builds whole-maze distance fields, which chunked levels are too big for
+        if COOPERATIVE_PLANNING and len(enemies) > 1 and not self.level_manager.get_current_level().chunked:
+            self.planner = CooperativePlanner(current_maze, self.distance_table)
+        else:
+            self.planner = None
+        self.ticks_until_replan = 0
+        return enemies
+
+    def create_enemy(self, x, y):
+        # Center the enemy in the cell
+        enemy_x = x * CELL_SIZE + (CELL_SIZE // 2)
+        enemy_y = y * CELL_SIZE + (CELL_SIZE // 2)
+        # Table lookups are instant, so only fall back to the worker without one
+        path_worker = self.path_worker if self.distance_table is None else None
+        return Enemy(enemy_x, enemy_y, 
+                     CELL_SIZE // 2 - 1, ENEMY_SPEED, self.find_path, path_worker,
+                     self.terrain_speed)
+
+    def replan_enemies(self):
+        """Plan all enemies together once per re-plan window"""
+        if self.planner is None:
+            return
+        self.ticks_until_replan -= 1
+        if self.ticks_until_replan > 0:
+            return
+        self.ticks_until_replan = COOP_REPLAN_TICKS
+
+        # Enemies between cells keep heading for their next waypoint and plan on from there
+        starts = [enemy.path[0] if enemy.path else
+                  (int(enemy.x // CELL_SIZE), int(enemy.y // CELL_SIZE))
+                  for enemy in self.enemies]
+        player_cell = self.player_cell()
+        intercept_cell = self.predict_player_cell()
+        goals = [intercept_cell if enemy.intercept else player_cell for enemy in self.enemies]
+        paths = self.planner.plan(starts, goals)
+
+        for enemy, path in zip(self.enemies, paths):
+            # Waits stay in the path as repeated cells, so the enemy keeps to its bookings.
+            # One heading for its start cell still has to reach it at step 0.
+            if enemy.path:
+                enemy.follow_plan(path, 0, COOP_STEP_TICKS)
+            else:
+                enemy.follow_plan(path[1:], 1, COOP_STEP_TICKS)
 
     def create_star(self):
         return self.create_game_object(Star, CELL_SIZE // 2)
 
     def create_diamonds(self):
         diamonds = []
-        current_maze = self.get_current_maze()
-        for y, row in enumerate(current_maze):
-            for x, cell in enumerate(row):
-                if cell == 'D':
-                    # Center the diamond in the cell
-                    diamond_x = x * CELL_SIZE + (CELL_SIZE // 2)
-                    diamond_y = y * CELL_SIZE + (CELL_SIZE // 2)
-                    diamonds.append(Diamond(diamond_x, diamond_y))
+        for x, y in MazeUtils.find_cells(self.get_current_maze(), 'D'):
+            # Center the diamond in the cell
+            diamond_x = x * CELL_SIZE + (CELL_SIZE // 2)
+            diamond_y = y * CELL_SIZE + (CELL_SIZE // 2)
+            diamonds.append(Diamond(diamond_x, diamond_y))
         return diamonds
 
+    def capture_world(self):
+        """Read-only copy of the level for the renderer, with nothing collected yet"""
+        level = self.level_manager.get_current_level()
+        self.world = StaticWorld(level.level_number, level.title, level.width, level.height,
+                                 snapshot_grid(level.maze), snapshot_grid(level.terrain))
+        self.taken = None
+        self.taken_this_tick = []
+
     def next_level(self):
         self.level_manager.next_level()
         self.start_level()
 
-    def draw_score_area(self, screen):
+    def draw_score_area(self, screen, view):
         screen_width = screen.get_width()
         screen_height = screen.get_height()
         scaled_score_height = int(SCORE_AREA_HEIGHT * screen_height/HEIGHT)
@@ -279,75 +467,53 @@ class PlayMode(GameMode):
                         (0, scaled_score_height), 
                         (screen_width, scaled_score_height), 2)
 
-        score_text = self.font.render(f"Score: {self.score}", True, THEME_TEXT)
+        score_text = self.font.render(f"Score: {view.score}", True, THEME_TEXT)
         score_rect = score_text.get_rect(midleft=(10, scaled_score_height // 2))
         screen.blit(score_text, score_rect)
 
-        level_text = self.font.render(f"Level: {self.level_manager.get_current_level().level_number}", True, THEME_TEXT)
+        level_text = self.font.render(f"Level: {view.world.number}", True, THEME_TEXT)
         level_rect = level_text.get_rect(midright=(screen_width - 10, scaled_score_height // 2))
         screen.blit(level_text, level_rect)
 
         # Add level title
-        current_level = self.level_manager.get_current_level()
-        if current_level.title:
-            title_text = self.title_font.render(current_level.title, True, THEME_TEXT)
+        if view.world.title:
+            title_text = self.title_font.render(view.world.title, True, THEME_TEXT)
             title_rect = title_text.get_rect(center=(screen_width // 2, scaled_score_height // 2))
             screen.blit(title_text, title_rect)
 
-    def render_maze(self, screen):
-        current_maze = self.get_current_maze()
-        
-        # Calculate visible range of cells based on camera position and zoom
-        start_x = max(0, int(self.game.camera_x // CELL_SIZE))
-        start_y = max(0, int(self.game.camera_y // CELL_SIZE))
-        end_x = min(MAZE_WIDTH, int((self.game.camera_x + self.game.viewport_width) // CELL_SIZE) + 1)
-        end_y = min(MAZE_HEIGHT, int((self.game.camera_y + self.game.viewport_height) // CELL_SIZE) + 1)
-
-        for y in range(start_y, end_y):
-            for x in range(start_x, end_x):
-                cell = current_maze[y][x]
-                if cell == 'X':  # Add wall rendering
-                    screen_x = (x * CELL_SIZE - self.game.camera_x) * self.game.zoom
-                    screen_y = (y * CELL_SIZE - self.game.camera_y) * self.game.zoom + SCORE_AREA_HEIGHT
-                    cell_size = CELL_SIZE * self.game.zoom
-                    pygame.draw.rect(screen, BLACK, (screen_x, screen_y, cell_size, cell_size))
-                elif cell in [' ', 'S', '*', 'D']:
-                    screen_x = (x * CELL_SIZE - self.game.camera_x) * self.game.zoom
-                    screen_y = (y * CELL_SIZE - self.game.camera_y) * self.game.zoom + SCORE_AREA_HEIGHT
-                    cell_size = CELL_SIZE * self.game.zoom
-                    pygame.draw.rect(screen, WHITE, (screen_x, screen_y, cell_size, cell_size))
-
-    def render_game_objects(self, screen, interpolation):
-        for coin in self.coins:
-            coin.draw(screen, self.game)
-
-        if self.enemy:
-            interpolated_x = self.enemy.x + (self.enemy.dx * interpolation)
-            interpolated_y = self.enemy.y + (self.enemy.dy * interpolation)
-            self.enemy.draw(screen, self.game, interpolated_x, interpolated_y)
+    def render_maze(self, screen, view, camera):
+        self.world_layer.draw(screen, camera, view.world, view.taken)
 
-        if self.player:
-            interpolated_x = self.player.x + (self.player.dx * interpolation)
-            interpolated_y = self.player.y + (self.player.dy * interpolation)
-            self.player.draw(screen, self.game, interpolated_x, interpolated_y)
+    def render_game_objects(self, screen, view, camera):
+        # Skip objects outside the viewport (one cell of margin for their radius)
+        min_x = camera.camera_x - CELL_SIZE
+        min_y = camera.camera_y - CELL_SIZE
+        max_x = camera.camera_x + camera.viewport_width + CELL_SIZE
+        max_y = camera.camera_y + camera.viewport_height + CELL_SIZE
+
+        # Coins and diamonds are part of the world layer drawn by render_maze
+        for enemy in view.enemies:
+            if not (min_x <= enemy.x <= max_x and min_y <= enemy.y <= max_y):
+                continue
+            Enemy.draw_state(screen, camera, enemy)
 
-        if self.star:
-            self.star.draw(screen, self.game)
+        Player.draw_state(screen, camera, view.player, view.particles)
 
-        for diamond in self.diamonds:
-            diamond.draw(screen, self.game)
+        star = view.star
+        if star and min_x <= star.x <= max_x and min_y <= star.y <= max_y:
+            Star.draw_state(screen, camera, star)
 
-    def draw_ui(self, screen):
+    def draw_ui(self, screen, view):
         screen_width = screen.get_width()
         screen_height = screen.get_height()
         
-        if self.state == GameState.PLAYING:
+        if view.state == GameState.PLAYING:
             instruction_text = "Press ESC to pause"
-        elif self.state == GameState.PAUSED:
+        elif view.state == GameState.PAUSED:
             instruction_text = "Press ESC to resume, X to exit"
-        elif self.state == GameState.GAME_OVER:
+        elif view.state == GameState.GAME_OVER:
             instruction_text = "Press ESC to return to menu"
-        elif self.state == GameState.LEVEL_COMPLETE:
+        elif view.state == GameState.LEVEL_COMPLETE:
             instruction_text = "Press N for next level, ESC for menu"
         else:
             instruction_text = ""  # No text for LEVEL_START or unexpected states
@@ -358,9 +524,13 @@ class PlayMode(GameMode):
             screen.blit(text, text_rect)
 
     def collect_coins(self):
-        for coin in self.coins[:]:
+        reach = self.player.radius + COIN_RADIUS
+        nearby = self.coins.near(self.player.x - reach, self.player.y - reach,
+                                 self.player.x + reach, self.player.y + reach)
+        for coin in nearby:
             if self.check_object_collision(self.player, coin):
                 self.coins.remove(coin)
+                self.taken_this_tick.append((int(coin.x // CELL_SIZE), int(coin.y // CELL_SIZE)))
                 self.score += COIN_VALUE
         
         if self.star and self.check_object_collision(self.player, self.star):
@@ -371,12 +541,16 @@ class PlayMode(GameMode):
         for diamond in self.diamonds[:]:
             if self.check_object_collision(self.player, diamond):
                 self.diamonds.remove(diamond)
+                self.taken_this_tick.append((int(diamond.x // CELL_SIZE), int(diamond.y // CELL_SIZE)))
                 self.score += DIAMOND_VALUE
 
     def check_enemy_collision(self):
-        if self.enemy and self.check_object_collision(self.player, self.enemy):
-            self.state = GameState.GAME_OVER
-            self.game.play_game_over_sound()
+        self.enemy_grid.rebuild(self.enemies)
+        for enemy in self.enemy_grid.query(self.player.x, self.player.y, self.player.radius):
+            if self.check_object_collision(self.player, enemy):
+                self.state = GameState.GAME_OVER
+                self.game.play_game_over_sound()
+                return
 
     def check_level_complete(self):
         if not self.coins and not self.star and not self.diamonds:
@@ -402,70 +576,81 @@ class PlayMode(GameMode):
             self.player.set_direction((0, -1))
 
     def render_pause_overlay(self, screen):
-        screen_width = screen.get_width()
-        screen_height = screen.get_height()
-        
-        overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-        overlay.fill((*THEME_BACKGROUND[:3], 150))  # Semi-transparent background
-        screen.blit(overlay, (0, 0))
-        
+        self.game.overlays.blit(screen, "pause", OVERLAY_COLOR, self.draw_pause_overlay)
+
+    def draw_pause_overlay(self, overlay):
+        screen_width, screen_height = overlay.get_size()
         pause_text = self.title_font.render("PAUSED", True, THEME_TEXT)
         pause_rect = pause_text.get_rect(center=(screen_width // 2, screen_height // 2))
-        screen.blit(pause_text, pause_rect)
+        overlay.blit(pause_text, pause_rect)
 
     def render_game_over_overlay(self, screen):
-        screen_width = screen.get_width()
-        screen_height = screen.get_height()
-        
-        overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-        overlay.fill((*THEME_BACKGROUND[:3], 150))  # Semi-transparent background
-        screen.blit(overlay, (0, 0))
-        
+        self.game.overlays.blit(screen, "game_over", OVERLAY_COLOR, self.draw_game_over_overlay)
+
+    def draw_game_over_overlay(self, overlay):
+        screen_width, screen_height = overlay.get_size()
         game_over_text = self.title_font.render("GAME OVER", True, THEME_ACCENT)
         game_over_rect = game_over_text.get_rect(center=(screen_width // 2, screen_height // 2))
-        screen.blit(game_over_text, game_over_rect)
+        overlay.blit(game_over_text, game_over_rect)
 
     def render_level_complete_overlay(self, screen):
-        screen_width = screen.get_width()
-        screen_height = screen.get_height()
-        
-        overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-        overlay.fill((*THEME_BACKGROUND[:3], 150))  # Semi-transparent background
-        screen.blit(overlay, (0, 0))
-        
+        self.game.overlays.blit(screen, "level_complete", OVERLAY_COLOR, self.draw_level_complete_overlay)
+
+    def draw_level_complete_overlay(self, overlay):
+        screen_width, screen_height = overlay.get_size()
         complete_text = self.title_font.render("LEVEL COMPLETE!", True, THEME_ACCENT)
         complete_rect = complete_text.get_rect(center=(screen_width // 2, screen_height // 2))
-        screen.blit(complete_text, complete_rect)
+        overlay.blit(complete_text, complete_rect)
 
         next_level_text = self.font.render("Press N for next level", True, THEME_TEXT)
         next_rect = next_level_text.get_rect(center=(screen_width // 2, screen_height // 2 + 50))
-        screen.blit(next_level_text, next_rect)
+        overlay.blit(next_level_text, next_rect)
 
-    def render_level_start_overlay(self, screen):
+    def render_level_start_overlay(self, screen, view):
         screen_width = screen.get_width()
         screen_height = screen.get_height()
         
-        overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-        overlay.fill((*THEME_BACKGROUND[:3], 150))  # Semi-transparent background
-        screen.blit(overlay, (0, 0))
-        
-        level_text = self.title_font.render(f"Level {self.level_manager.get_current_level().level_number}", True, THEME_TEXT)
-        level_rect = level_text.get_rect(center=(screen_width // 2, screen_height // 2 - 60))
-        screen.blit(level_text, level_rect)
+        world = view.world
+        key = ("level_start", world.number, world.title)
+        self.game.overlays.blit(screen, key, OVERLAY_COLOR,
+                                lambda overlay: self.draw_level_start_overlay(overlay, world))
 
-        if self.level_manager.get_current_level().title:
-            title_text = self.font.render(self.level_manager.get_current_level().title, True, THEME_TEXT)
-            title_rect = title_text.get_rect(center=(screen_width // 2, screen_height // 2))
-            screen.blit(title_text, title_rect)
-
-        # Add countdown display
-        countdown_text = self.title_font.render(str(self.remaining_time), True, THEME_ACCENT)
+        # Only the countdown changes while the overlay is up
+        countdown_text = self.title_font.render(str(view.countdown), True, THEME_ACCENT)
         countdown_rect = countdown_text.get_rect(center=(screen_width // 2, screen_height // 2 + 60))
         screen.blit(countdown_text, countdown_rect)
+        self.shown_countdown = view.countdown
+        self.countdown_rect = countdown_rect
+
+    def draw_level_start_overlay(self, overlay, world):
+        screen_width, screen_height = overlay.get_size()
+        level_text = self.title_font.render(f"Level {world.number}", True, THEME_TEXT)
+        level_rect = level_text.get_rect(center=(screen_width // 2, screen_height // 2 - 60))
+        overlay.blit(level_text, level_rect)
+
+        if world.title:
+            title_text = self.font.render(world.title, True, THEME_TEXT)
+            title_rect = title_text.get_rect(center=(screen_width // 2, screen_height // 2))
+            overlay.blit(title_text, title_rect)
 
         ready_text = self.font.render("Get ready!", True, THEME_TEXT)
         ready_rect = ready_text.get_rect(center=(screen_width // 2, screen_height // 2 + 120))
-        screen.blit(ready_text, ready_rect)
+        overlay.blit(ready_text, ready_rect)
+
+    def keep_chunks_resident(self):
+        """Keep the maze chunks under the camera and around every actor decoded"""
+        current_level = self.level_manager.get_current_level()
+        if not current_level.chunked:
+            return
+        regions = [(int(self.game.camera_x // CELL_SIZE), int(self.game.camera_y // CELL_SIZE),
+                    int((self.game.camera_x + self.game.viewport_width) // CELL_SIZE),
+                    int((self.game.camera_y + self.game.viewport_height) // CELL_SIZE))]
+        for actor in [self.player] + self.enemies:
+            cell_x, cell_y = int(actor.x // CELL_SIZE), int(actor.y // CELL_SIZE)
+            regions.append((cell_x - 1, cell_y - 1, cell_x + 1, cell_y + 1))
+        for grid in (current_level.maze, current_level.terrain):
+            for region in regions:
+                grid.keep_resident(*region)
 
     def update_camera(self):
         # Keep player centered by setting camera directly to player position minus half screen
@@ -478,25 +663,42 @@ class PlayMode(GameMode):
 
     def check_object_collision(self, obj1, obj2):
         """Returns True if two game objects are colliding"""
-        rect1 = pygame.Rect(obj1.x - obj1.radius, 
-                          obj1.y - obj1.radius,
-                          obj1.radius * 2, 
-                          obj1.radius * 2)
-        rect2 = pygame.Rect(obj2.x - obj2.radius, 
-                          obj2.y - obj2.radius,
-                          obj2.radius * 2, 
-                          obj2.radius * 2)
-        return rect1.colliderect(rect2)
-
-    def render_state_overlay(self, screen):
+        # Same bounding-box overlap test as Rect.colliderect, without building Rects
+        reach = obj1.radius + obj2.radius
+        return abs(obj1.x - obj2.x) < reach and abs(obj1.y - obj2.y) < reach
+
+    def on_quality_change(self, settings):
+        if self.player:
+            self.player.max_particles = settings["particle_cap"]
+        ITEMS["trail"]["circles"].gradients = settings["trail_gradients"]
+
+    def changed_regions(self, screen):
+        view = self.snapshots.view(1)
+        if view is None:
+            return None
+        if (view.state == GameState.PLAYING or view.state != self.shown_state or
+                view.camera.zoom != view.camera.target_zoom):
+            return None
+        if view.state == GameState.LEVEL_START:
+            if self.countdown_rect is None:
+                return None
+            if view.countdown == self.shown_countdown:
+                return []
+            # The next digit may be wider than the last
+            return [self.countdown_rect.inflate(self.countdown_rect.width, 0)]
+        # Paused, game over and level complete screens only change on input
+        return []
+
+    def render_state_overlay(self, screen, view):
         overlays = {
-            GameState.LEVEL_START: self.render_level_start_overlay,
+            GameState.LEVEL_START: lambda screen: self.render_level_start_overlay(screen, view),
             GameState.PAUSED: self.render_pause_overlay,
             GameState.GAME_OVER: self.render_game_over_overlay,
             GameState.LEVEL_COMPLETE: self.render_level_complete_overlay
         }
-        if self.state in overlays:
-            overlays[self.state](screen)
+        self.shown_state = view.state
+        if view.state in overlays:
+            overlays[view.state](screen)
 
     @staticmethod
     def lerp_color(color1, color2, t):
@@ -0,0 +1,65 @@
+from collections import deque
+
+from constants import (QUALITY_TIERS, QUALITY_FRAME_BUDGET_MS, QUALITY_WINDOW, QUALITY_RESTORE_SHARE,
+                       QUALITY_COOLDOWN, QUALITY_HISTORY_SIZE)
+
+
+class QualityGovernor:
+    """Steps rendering quality down when frames run long, and back up when they are quick.
+
+    record() takes each frame's time. Once `window` frames are in, an
+    average over budget drops one tier, and an average under
+    `restore_share` of the budget climbs one. The gap between the two
+    thresholds and the `cooldown` frames after every change keep it from
+    flapping between neighbouring tiers.
+    """
+    def __init__(self, tiers=QUALITY_TIERS, budget_ms=QUALITY_FRAME_BUDGET_MS, window=QUALITY_WINDOW,
+                 restore_share=QUALITY_RESTORE_SHARE, cooldown=QUALITY_COOLDOWN, history_size=QUALITY_HISTORY_SIZE):
+        self.tiers = tiers
+        self.budget_ms = budget_ms
+        self.restore_share = restore_share
+        self.cooldown = cooldown
+        self.frame_times = deque(maxlen=window)
+        self.frames_since_change = 0
+        self.tier = 0
+        # (frame number, old tier, new tier, average ms) for every change
+        self.history = deque(maxlen=history_size)
+        self.frames = 0
+
+    @property
+    def settings(self):
+        return self.tiers[self.tier]
+
+    def average_ms(self):
+        return sum(self.frame_times) / len(self.frame_times) if self.frame_times else 0.0
+
+    def record(self, frame_ms):
+        """Add a frame time; returns the new tier's settings when the tier changes, else None"""
+        self.frames += 1
+        self.frames_since_change += 1
+        self.frame_times.append(frame_ms)
+        if len(self.frame_times) < self.frame_times.maxlen or self.frames_since_change < self.cooldown:
+            return None
+        average = self.average_ms()
+        if average > self.budget_ms and self.tier < len(self.tiers) - 1:
+            return self.change_tier(self.tier + 1, average)
+        if average < self.budget_ms * self.restore_share and self.tier > 0:
+            return self.change_tier(self.tier - 1, average)
+        return None
+
+    def change_tier(self, tier, average):
+        self.history.append((self.frames, self.tier, tier, round(average, 2)))
+        self.tier = tier
+        self.frames_since_change = 0
+        # Frames from the old tier say nothing about the new one
+        self.frame_times.clear()
+        return self.settings
+
+    def telemetry(self):
+        return {
+            "tier": self.tier,
+            "name": self.settings["name"],
+            "average_ms": round(self.average_ms(), 2),
+            "frames": self.frames,
+            "history": list(self.history),
+        }
@@ -0,0 +1,188 @@
+import heapq
+from collections import deque
+
+from constants import *
+
+
+class ReachabilityMap:
+    """Step distances from the player start to every open cell, kept current as cells change.
+
+    Opening a cell relaxes distances outward from it. Walling one off
+    invalidates only the cells whose shortest route ran through it, then
+    re-seeds them from their still-valid neighbours. Moving the start, or
+    changing more than `batch_limit` cells at once, falls back to a full
+    breadth-first search. The summary counts follow along, cell by cell,
+    from the cells each update touched.
+    """
+    PICKUPS = (' ', '*', 'D')  # Every empty cell holds a coin
+    # What a cell counts towards in the summary, as bits of `kinds`
+    OPEN, REACHABLE, UNREACHABLE_PICKUP, ENEMY = 1, 2, 4, 8
+
+    def __init__(self, maze, batch_limit=256):
+        self.maze = maze
+        self.width = len(maze[0])
+        self.height = len(maze)
+        self.batch_limit = batch_limit
+        self.version = 0
+        self.rebuild()
+
+    def find_start(self):
+        """The player spawns on the first 'S' in reading order, as in play mode"""
+        for y, row in enumerate(self.maze):
+            for x, cell in enumerate(row):
+                if cell == 'S':
+                    return (x, y)
+        return None
+
+    def passable(self, x, y):
+        return self.maze[y][x] != 'X'
+
+    def neighbors(self, x, y):
+        for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height and self.maze[ny][nx] != 'X':
+                yield nx, ny
+
+    def rebuild(self):
+        self.start = self.find_start()
+        self.distances = [[None] * self.width for _ in range(self.height)]
+        self.version += 1
+        if self.start is not None:
+            self.search()
+        self.recount_all()
+
+    def search(self):
+        """Breadth-first distances outward from the start"""
+        distances = self.distances
+        distances[self.start[1]][self.start[0]] = 0
+        frontier = deque([self.start])
+        while frontier:
+            x, y = frontier.popleft()
+            next_distance = distances[y][x] + 1
+            for nx, ny in self.neighbors(x, y):
+                if distances[ny][nx] is None:
+                    distances[ny][nx] = next_distance
+                    frontier.append((nx, ny))
+
+    def update(self, cells):
+        """Catch up with edits to the given cells.
+
+        Returns the cells whose distance changed, or None when the whole map
+        was rebuilt.
+        """
+        cells = set(cells)
+        # Only look for a new start when the edit could have moved it
+        start_moved = (self.start is None or self.maze[self.start[1]][self.start[0]] != 'S' or
+                       any(self.maze[y][x] == 'S' for x, y in cells))
+        if len(cells) > self.batch_limit or (start_moved and self.find_start() != self.start):
+            self.rebuild()
+            return None
+
+        # Close new walls before opening cells, so no opening relaxes from a stale distance
+        opened = [(x, y) for x, y in cells if self.passable(x, y) and self.distances[y][x] is None]
+        changed = set()
+        for x, y in cells:
+            if not self.passable(x, y) and self.distances[y][x] is not None:
+                self.close_cell(x, y, changed)
+        self.relax(opened, changed)
+        if cells:
+            # Pickups and spawns may have moved even when no distance did
+            self.version += 1
+            self.recount(cells | changed)
+        return changed
+
+    def relax(self, cells, changed):
+        """Seed cells from their reached neighbours and spread any shorter distances outward"""
+        distances = self.distances
+        heap = []
+        for x, y in cells:
+            reached = [distances[ny][nx] for nx, ny in self.neighbors(x, y) if distances[ny][nx] is not None]
+            if reached:
+                heap.append((min(reached) + 1, (x, y)))
+        # Seeds start at different distances, so settle them nearest first
+        heapq.heapify(heap)
+        while heap:
+            distance, (x, y) = heapq.heappop(heap)
+            if distances[y][x] is not None and distances[y][x] <= distance:
+                continue
+            distances[y][x] = distance
+            changed.add((x, y))
+            for nx, ny in self.neighbors(x, y):
+                if distances[ny][nx] is None or distances[ny][nx] > distance + 1:
+                    heapq.heappush(heap, (distance + 1, (nx, ny)))
+
+    def close_cell(self, x, y, changed):
+        distances = self.distances
+        old = distances[y][x]
+        distances[y][x] = None
+        changed.add((x, y))
+
+        # Drop every cell left without a neighbour one step closer to the start,
+        # nearest first, so a cell's supporters are settled before it is checked
+        heap = [(old + 1, cell) for cell in self.neighbors(x, y) if distances[cell[1]][cell[0]] == old + 1]
+        heapq.heapify(heap)
+        invalid = []
+        while heap:
+            distance, (cx, cy) = heapq.heappop(heap)
+            if distances[cy][cx] != distance:
+                continue
+            if any(distances[ny][nx] == distance - 1 for nx, ny in self.neighbors(cx, cy)):
+                continue
+            distances[cy][cx] = None
+            invalid.append((cx, cy))
+            changed.add((cx, cy))
+            for nx, ny in self.neighbors(cx, cy):
+                if distances[ny][nx] == distance + 1:
+                    heapq.heappush(heap, (distance + 1, (nx, ny)))
+
+        # Re-seed the dropped cells from whatever valid neighbours they still have
+        self.relax(invalid, changed)
+
+    def cell_kind(self, x, y):
+        cell = self.maze[y][x]
+        if cell == 'X':
+            return 0
+        kind = self.OPEN
+        if self.distances[y][x] is not None:
+            kind |= self.REACHABLE
+        elif cell in self.PICKUPS:
+            kind |= self.UNREACHABLE_PICKUP
+        if cell == 'E':
+            kind |= self.ENEMY
+        return kind
+
+    def recount_all(self):
+        self.kinds = [bytearray(self.width) for _ in range(self.height)]
+        self.open_cells = self.reachable_cells = 0
+        self.unreachable_pickups = set()
+        self.enemies = set()
+        self.recount((x, y) for y in range(self.height) for x in range(self.width))
+
+    def recount(self, cells):
+        """Move cells whose summary kind changed from their old tallies to their new ones"""
+        for x, y in cells:
+            old, new = self.kinds[y][x], self.cell_kind(x, y)
+            if old == new:
+                continue
+            self.kinds[y][x] = new
+            gained, lost = new & ~old, old & ~new
+            self.open_cells += bool(gained & self.OPEN) - bool(lost & self.OPEN)
+            self.reachable_cells += bool(gained & self.REACHABLE) - bool(lost & self.REACHABLE)
+            if lost & self.UNREACHABLE_PICKUP:
+                self.unreachable_pickups.discard((x, y))
+            if gained & self.UNREACHABLE_PICKUP:
+                self.unreachable_pickups.add((x, y))
+            if lost & self.ENEMY:
+                self.enemies.discard((x, y))
+            if gained & self.ENEMY:
+                self.enemies.add((x, y))
+
+    def summary(self):
+        """Open and reachable cell counts, unreachable pickups and enemy spawn distances"""
+        reading_order = lambda cell: (cell[1], cell[0])
+        return {
+            "open_cells": self.open_cells,
+            "reachable_cells": self.reachable_cells,
+            "unreachable_pickups": sorted(self.unreachable_pickups, key=reading_order),
+            "enemy_distances": [self.distances[y][x] for x, y in sorted(self.enemies, key=reading_order)],
+        }
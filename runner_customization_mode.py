@@ -74,8 +74,8 @@ class RunnerCustomizationMode(GameMode):
         self.scale = min(screen_width / 1280, screen_height / 720)
         
         # Update fonts
-        self.font = pygame.font.Font(None, int(36 * self.scale))
-        self.large_font = pygame.font.Font(None, int(48 * self.scale))
+        self.font = self.game.text_cache.font(int(36 * self.scale))
+        self.large_font = self.game.text_cache.font(int(48 * self.scale))
         
         # Calculate dimensions
         self.button_width = int(120 * self.scale)
@@ -118,7 +118,7 @@ class RunnerCustomizationMode(GameMode):
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             
             # Check slot button clicks
             for slot_name, buttons in self.slot_buttons.items():
@@ -131,6 +131,10 @@ class RunnerCustomizationMode(GameMode):
             if event.key == pygame.K_ESCAPE:
                 self.game.set_mode("menu")
 
+    def changed_regions(self, screen):
+        # Nothing here moves between events
+        return []
+
     def render(self, screen, interpolation):
         screen_width = screen.get_width()
         screen_height = screen.get_height()
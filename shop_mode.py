@@ -8,8 +8,8 @@ from player_renderer import PlayerRenderer
 class ShopMode(GameMode):
     def __init__(self, game):
         super().__init__(game)
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = self.game.text_cache.font(36)
+        self.small_font = self.game.text_cache.font(24)
         self.selected_item = None
         self.grid_size = 120  # Size of each grid cell
         self.padding = 20     # Padding between cells
@@ -38,6 +38,10 @@ class ShopMode(GameMode):
             elif event.key == pygame.K_DOWN:
                 self.scroll_offset -= self.scroll_speed
 
+    def changed_regions(self, screen):
+        # Nothing here moves between events
+        return []
+
     def render(self, screen, interpolation):
         screen_width = screen.get_width()
         screen_height = screen.get_height()
@@ -1,33 +1,85 @@
-import pygame
+import hashlib
 import math
+import os
+import sys
+from array import array
+
+import pygame
+from constants import SOUND_CACHE_DIR
+
+try:
+    import numpy as np
+except ImportError:  # Synthesis falls back to a single array('h') pass
+    np = None
+
+SAMPLE_RATE = 22050
 
 class SoundManager:
     def __init__(self):
-        pygame.mixer.init(frequency=22050, size=-16, channels=1, buffer=512)
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1, buffer=512)
+        self.sounds = {}
+        self.loaded = False
+
+    def load_sounds(self):
+        """Build every effect; safe to run on a background thread"""
         self.sounds = {
             'game_over': self.create_sound(duration=1.0, start_freq=440, end_freq=0),
             'star_consume': self.create_sound(duration=0.2, start_freq=880, end_freq=1320),
             'coin_collect': self.create_sound(duration=0.1, start_freq=660, end_freq=880),
             'level_start': self.create_sound(duration=0.5, start_freq=440, end_freq=660)
         }
+        self.loaded = True
 
     def create_sound(self, duration, start_freq, end_freq):
-        sample_rate = 22050
-        num_samples = int(duration * sample_rate)
-        
-        buffer = bytearray()
-        for i in range(num_samples):
-            t = i / sample_rate
+        return pygame.mixer.Sound(buffer=self.load_samples(duration, start_freq, end_freq))
+
+    def load_samples(self, duration, start_freq, end_freq):
+        """Return 16-bit PCM for a sweep, from the disk cache when it has been made before"""
+        path = self.cache_path(duration, start_freq, end_freq)
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            pass
+
+        samples = self.synthesize(duration, start_freq, end_freq)
+        try:
+            os.makedirs(SOUND_CACHE_DIR, exist_ok=True)
+            # Write then rename so a crash never leaves a truncated buffer behind
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(samples)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not cache sound: {e}")
+        return samples
+
+    @staticmethod
+    def cache_path(duration, start_freq, end_freq):
+        key = f"sweep-v1-{SAMPLE_RATE}-{duration!r}-{start_freq!r}-{end_freq!r}"
+        return os.path.join(SOUND_CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + '.pcm')
+
+    @staticmethod
+    def synthesize(duration, start_freq, end_freq):
+        num_samples = int(duration * SAMPLE_RATE)
+        if np is not None:
+            t = np.arange(num_samples) / SAMPLE_RATE
             frequency = start_freq + (end_freq - start_freq) * t
-            value = int(32767 * math.sin(2 * math.pi * frequency * t))
-            buffer.extend(value.to_bytes(2, byteorder='little', signed=True))
-        
-        return pygame.mixer.Sound(buffer=bytes(buffer))
+            values = 32767 * np.sin(2 * np.pi * frequency * t)
+            return values.astype('<i2').tobytes()
+
+        samples = array('h', (
+            int(32767 * math.sin(2 * math.pi * (start_freq + (end_freq - start_freq) * t) * t))
+            for t in (i / SAMPLE_RATE for i in range(num_samples))
+        ))
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        return samples.tobytes()
 
     def play_sound(self, sound_name):
         if sound_name in self.sounds:
             self.sounds[sound_name].play()
-        else:
+        elif self.loaded:
             print(f"Sound '{sound_name}' not found.")
 
     def set_volume(self, sound_name, volume):
@@ -37,4 +89,4 @@ class SoundManager:
             print(f"Sound '{sound_name}' not found.")
 
     def set_global_volume(self, volume):
-        pygame.mixer.music.set_volume(volume)
\ No newline at end of file
+        pygame.mixer.music.set_volume(volume)
@@ -0,0 +1,47 @@
+class SpatialGrid:
+    """Uniform-grid broadphase that buckets objects by the cell holding their centre"""
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.max_radius = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.max_radius = 0
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, obj):
+        self.cells.setdefault(self.cell_of(obj.x, obj.y), []).append(obj)
+        self.max_radius = max(self.max_radius, obj.radius)
+
+    def rebuild(self, objects):
+        self.clear()
+        for obj in objects:
+            self.insert(obj)
+
+    def query(self, x, y, radius):
+        """Yield objects whose bounds may overlap a circle of the given radius"""
+        reach = radius + self.max_radius
+        min_x, min_y = self.cell_of(x - reach, y - reach)
+        max_x, max_y = self.cell_of(x + reach, y + reach)
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                yield from self.cells.get((cell_x, cell_y), ())
+
+    def query_rect(self, min_x, min_y, max_x, max_y):
+        """Yield objects whose bounds may overlap a world-space rectangle"""
+        reach = self.max_radius
+        min_cell_x, min_cell_y = self.cell_of(min_x - reach, min_y - reach)
+        max_cell_x, max_cell_y = self.cell_of(max_x + reach, max_y + reach)
+        for cell_y in range(min_cell_y, max_cell_y + 1):
+            for cell_x in range(min_cell_x, max_cell_x + 1):
+                yield from self.cells.get((cell_x, cell_y), ())
+
+    def remove(self, obj):
+        cell = self.cell_of(obj.x, obj.y)
+        bucket = self.cells[cell]
+        bucket.remove(obj)
+        if not bucket:
+            del self.cells[cell]
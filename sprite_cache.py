@@ -0,0 +1,35 @@
+from collections import OrderedDict
+
+from constants import SPRITE_CACHE_SIZE
+
+
+class SpriteCache:
+    """Pre-rendered entity sprites with LRU eviction.
+
+    Each sprite is baked once per key, which callers build from the kind of
+    entity, its on-screen size and its colour, so a zoom or window change
+    simply asks for new keys. Sprites have odd sides with the entity centred
+    on the middle pixel. Like cached text, they must only ever be blitted.
+    """
+    def __init__(self, max_sprites=SPRITE_CACHE_SIZE):
+        self.max_sprites = max_sprites
+        self.sprites = OrderedDict()
+
+    def sprite(self, key, bake):
+        """Cached sprite for key, calling bake() to draw it the first time"""
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = bake().convert_alpha()
+            self.sprites[key] = sprite
+            if len(self.sprites) > self.max_sprites:
+                self.sprites.popitem(last=False)
+        else:
+            self.sprites.move_to_end(key)
+        return sprite
+
+    def blit(self, screen, center, key, bake):
+        sprite = self.sprite(key, bake)
+        screen.blit(sprite, (center[0] - sprite.get_width() // 2, center[1] - sprite.get_height() // 2))
+
+    def clear(self):
+        self.sprites.clear()
@@ -0,0 +1,84 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StartupPipeline:
+    """Runs startup work now, on a background thread or on first use, and keeps a timeline.
+
+    Every step is recorded with where it ran and how long it took, so
+    report() can show what the first frame waited for and what was deferred.
+    """
+    def __init__(self, max_workers=2):
+        self.origin = time.perf_counter()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self.tasks = {}
+        self.timeline = []
+        self.deferred = []
+        self.first_frame_ms = None
+        self.lock = threading.Lock()
+
+    def now_ms(self):
+        return (time.perf_counter() - self.origin) * 1000
+
+    def record(self, name, where, start_ms):
+        with self.lock:
+            self.timeline.append((name, where, start_ms, self.now_ms() - start_ms))
+
+    def run(self, name, func, *args):
+        """Run a step right away on the calling thread"""
+        start_ms = self.now_ms()
+        result = func(*args)
+        self.record(name, "main" if self.first_frame_ms is None else "on demand", start_ms)
+        return result
+
+    def submit(self, name, func, *args):
+        """Run a step on a background thread; wait(name) blocks until it is done"""
+        def task():
+            start_ms = self.now_ms()
+            try:
+                return func(*args)
+            finally:
+                self.record(name, "background", start_ms)
+        self.tasks[name] = self.executor.submit(task)
+        return self.tasks[name]
+
+    def defer(self, name):
+        """Note a step that will only run when something first needs it"""
+        self.deferred.append(name)
+
+    def is_ready(self, name):
+        task = self.tasks.get(name)
+        return task is None or task.done()
+
+    def wait(self, name):
+        task = self.tasks.get(name)
+        if task is not None:
+            return task.result()
+
+    def mark_first_frame(self):
+        if self.first_frame_ms is None:
+            self.first_frame_ms = self.now_ms()
+
+    def report(self):
+        """Lines describing the startup timeline, in start order"""
+        with self.lock:
+            timeline = sorted(self.timeline, key=lambda entry: entry[2])
+        lines = []
+        if self.first_frame_ms is not None:
+            lines.append(f"Startup timeline (first frame at {self.first_frame_ms:.1f} ms):")
+        else:
+            lines.append("Startup timeline:")
+        for name, where, start_ms, duration_ms in timeline:
+            lines.append(f"  {start_ms:8.1f} ms  +{duration_ms:7.1f} ms  {name:<22} {where}")
+        finished = {entry[0] for entry in timeline}
+        for name in self.tasks:
+            if name not in finished:
+                lines.append(f"  {'':26}{name:<22} background (running)")
+        for name in self.deferred:
+            if name not in finished:
+                lines.append(f"  {'':26}{name:<22} deferred until first use")
+        return lines
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+import pygame
+from constants import TEXT_CACHE_MAX_FONTS, TEXT_CACHE_MAX_SURFACES
+
+
+class CachedFont:
+    """Stands in for pygame.font.Font; render() goes through the shared surface cache"""
+    def __init__(self, cache, face, size, font):
+        self.cache = cache
+        self.face = face
+        self.size_px = size
+        self.font = font
+
+    def render(self, text, antialias, color, background=None):
+        return self.cache.render(self, text, antialias, color, background)
+
+    def __getattr__(self, name):
+        # size(), get_height() and friends come straight from the real font
+        return getattr(self.font, name)
+
+
+class TextCache:
+    """Shared cache of fonts and rendered text, with LRU eviction.
+
+    Fonts are kept per (face, size) and rendered surfaces per (face, size,
+    text, antialias, color, background). Cached surfaces are shared between
+    callers, so they must only ever be blitted, never drawn on.
+    """
+    def __init__(self, max_fonts=TEXT_CACHE_MAX_FONTS, max_surfaces=TEXT_CACHE_MAX_SURFACES):
+        self.max_fonts = max_fonts
+        self.max_surfaces = max_surfaces
+        self.fonts = OrderedDict()
+        self.surfaces = OrderedDict()
+
+    def font(self, size, face=None):
+        key = (face, max(1, int(size)))
+        font = self.fonts.get(key)
+        if font is None:
+            font = CachedFont(self, face, key[1], pygame.font.Font(face, key[1]))
+            self.fonts[key] = font
+            if len(self.fonts) > self.max_fonts:
+                self.fonts.popitem(last=False)
+        else:
+            self.fonts.move_to_end(key)
+        return font
+
+    def render(self, font, text, antialias, color, background=None):
+        key = (font.face, font.size_px, text, antialias, tuple(color),
+               tuple(background) if background is not None else None)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.font.render(text, antialias, color, background)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_surfaces:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self.fonts.clear()
+        self.surfaces.clear()
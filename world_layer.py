@@ -0,0 +1,193 @@
+from types import SimpleNamespace
+
+import pygame
+
+from constants import *
+from game_objects import Coin, Diamond
+
+
+class WorldRaster:
+    """The static world around the camera, pre-rendered at one zoom"""
+    def __init__(self, world, zoom, cells):
+        self.world = world
+        self.zoom = zoom
+        self.cells = cells  # (x, y, width, height) of the cells on the surface
+        # Walls are left as the black fill
+        self.surface = pygame.Surface((max(1, round(cells[2] * CELL_SIZE * zoom)),
+                                       max(1, round(cells[3] * CELL_SIZE * zoom)))).convert()
+        self.surface.fill((0, 0, 0))
+
+    def covers(self, start_x, start_y, end_x, end_y):
+        x, y, width, height = self.cells
+        return x <= start_x and y <= start_y and end_x <= x + width and end_y <= y + height
+
+    def cell_rect(self, x, y):
+        """Pixel bounds of a cell on the surface, edges rounded so cells tile exactly"""
+        origin_x, origin_y = self.cells[:2]
+        scale = CELL_SIZE * self.zoom
+        left, top = round((x - origin_x) * scale), round((y - origin_y) * scale)
+        return pygame.Rect(left, top, round((x + 1 - origin_x) * scale) - left,
+                           round((y + 1 - origin_y) * scale) - top)
+
+    def draw_cell(self, x, y):
+        pygame.draw.rect(self.surface, TERRAIN_COLORS.get(self.world.terrain[y][x], WHITE), self.cell_rect(x, y))
+
+    def erase(self, x, y):
+        origin_x, origin_y, width, height = self.cells
+        if origin_x <= x < origin_x + width and origin_y <= y < origin_y + height:
+            self.draw_cell(x, y)
+
+
+class WorldLayer:
+    """The parts of the play field that never move, pre-rendered around the camera.
+
+    Terrain, walls, coins and diamonds are drawn once onto a surface covering
+    the visible cells plus `margin` cells on each side, so a frame draws the
+    static world with a single blit. Everything is drawn from the snapshot's
+    StaticWorld and TakenCells, never the live level: pickups collected
+    since the last frame are erased in place, and a surface is only redrawn
+    when the camera leaves it or a new world is drawn.
+
+    Every one of `mip_zooms` (scaled by the render scale) is rendered ahead
+    of time and kept for as long as the world is shown: each frame with a
+    settled zoom draws one mip that is missing or that the camera has moved
+    away from, so a new level has them all within a few frames of its
+    countdown. While the camera zoom is easing, frames blit the ready mip
+    nearest the current zoom as it is, centred on the camera: easing never
+    scales a surface, and only redraws one if the camera runs past a mip's
+    margin mid-ease. Only once zoom settles is the layer drawn at the
+    exact zoom.
+    """
+    def __init__(self, margin=WORLD_LAYER_MARGIN, mip_zooms=ZOOM_MIP_LEVELS):
+        self.margin = margin
+        self.mip_levels = sorted(mip_zooms)
+        self.mip_zooms = []
+        self.render_scale = None
+        # One surface per mip zoom, plus at most one for a settled zoom between them
+        self.rasters = {}
+        self.world = None
+        # Cells whose pickup is gone, and the newest TakenCells link applied
+        self.collected = set()
+        self.taken = None
+
+    def invalidate(self):
+        self.rasters.clear()
+
+    def set_world(self, world):
+        self.invalidate()
+        self.world = world
+        self.collected = set()
+        self.taken = None
+
+    def catch_up(self, taken):
+        """Erase the pickups collected in the ticks since the last frame"""
+        links = []
+        link = taken
+        while link is not self.taken:
+            if link is None:
+                # Not a continuation of what was applied; start over from the full list
+                self.set_world(self.world)
+                return self.catch_up(taken)
+            links.append(link)
+            link = link.previous
+        for link in reversed(links):
+            for x, y in link.cells:
+                self.collected.add((x, y))
+                for raster in self.rasters.values():
+                    raster.erase(x, y)
+        self.taken = taken
+
+    def visible_cells(self, game, world):
+        """Same cell range render_maze has always drawn"""
+        start_x = max(0, int(game.camera_x // CELL_SIZE))
+        start_y = max(0, int(game.camera_y // CELL_SIZE))
+        end_x = min(world.width, int((game.camera_x + game.viewport_width) // CELL_SIZE) + 1)
+        end_y = min(world.height, int((game.camera_y + game.viewport_height) // CELL_SIZE) + 1)
+        return start_x, start_y, end_x, end_y
+
+    @staticmethod
+    def view_at(game, zoom):
+        """The camera as it would be at another zoom, keeping the same centre"""
+        width = game.viewport_width * game.zoom / zoom
+        height = game.viewport_height * game.zoom / zoom
+        return SimpleNamespace(camera_x=game.camera_x + (game.viewport_width - width) / 2,
+                               camera_y=game.camera_y + (game.viewport_height - height) / 2,
+                               viewport_width=width, viewport_height=height, zoom=zoom)
+
+    def nearest_mip(self, zoom):
+        """The closest mip already drawn, or the closest of all if none is"""
+        ready = [mip for mip in self.mip_zooms if mip in self.rasters] or self.mip_zooms
+        return min(ready, key=lambda mip: abs(mip - zoom))
+
+    def ensure(self, world, game, zoom, sprite_cache):
+        """The surface for a zoom, redrawn if it no longer covers the view at that zoom"""
+        view = self.view_at(game, zoom)
+        visible = self.visible_cells(view, world)
+        raster = self.rasters.get(zoom)
+        if raster is None or not raster.covers(*visible):
+            raster = self.rebuild(world, zoom, visible, sprite_cache)
+        return raster, view
+
+    def set_render_scale(self, render_scale):
+        self.mip_zooms = [zoom * render_scale for zoom in self.mip_levels]
+        self.render_scale = render_scale
+        self.invalidate()
+
+    def prepare_mip(self, world, game):
+        """Draw at most one mip that is missing or that the camera has left"""
+        for zoom in self.mip_zooms:
+            raster = self.rasters.get(zoom)
+            if raster is None or not raster.covers(*self.visible_cells(self.view_at(game, zoom), world)):
+                self.ensure(world, game, zoom, game.sprite_cache)
+                return
+
+    def draw(self, screen, game, world, taken):
+        """Blit the layer for a snapshot's world and taken cells, redrawing it first if it is stale"""
+        if self.world is not world:
+            self.set_world(world)
+        # Collected pickups first, so fresh surfaces never draw them
+        self.catch_up(taken)
+        if self.render_scale != game.render_scale:
+            self.set_render_scale(game.render_scale)
+
+        if game.zoom == game.target_zoom:
+            zoom = game.zoom
+            # Keep the mips and the surface for this zoom, nothing else
+            for stale in [key for key in self.rasters if key != zoom and key not in self.mip_zooms]:
+                del self.rasters[stale]
+        else:
+            zoom = self.nearest_mip(game.zoom)
+        raster, view = self.ensure(world, game, zoom, game.sprite_cache)
+
+        x, y = raster.cells[:2]
+        origin_x = (x * CELL_SIZE - view.camera_x) * zoom
+        origin_y = (y * CELL_SIZE - view.camera_y) * zoom + SCORE_AREA_HEIGHT
+        screen.blit(raster.surface, (round(origin_x), round(origin_y)))
+
+        if zoom == game.zoom:
+            self.prepare_mip(world, game)
+
+    def rebuild(self, world, zoom, visible, sprite_cache):
+        start_x, start_y, end_x, end_y = visible
+        x0, y0 = max(0, start_x - self.margin), max(0, start_y - self.margin)
+        x1, y1 = min(world.width, end_x + self.margin), min(world.height, end_y + self.margin)
+        raster = WorldRaster(world, zoom, (x0, y0, x1 - x0, y1 - y0))
+        pickups = []
+        for y in range(y0, y1):
+            row = world.maze[y][x0:x1]
+            for x, cell in enumerate(row, x0):
+                if cell in (' ', 'S', '*', 'D'):
+                    raster.draw_cell(x, y)
+                    if cell in (' ', 'D') and (x, y) not in self.collected:
+                        pickups.append((Coin if cell == ' ' else Diamond, x, y))
+
+        # Objects draw relative to a camera; put that camera on the surface's corner
+        view = SimpleNamespace(camera_x=x0 * CELL_SIZE,
+                               camera_y=y0 * CELL_SIZE + SCORE_AREA_HEIGHT / zoom,
+                               zoom=zoom, sprite_cache=sprite_cache)
+        for pickup_class, x, y in pickups:
+            pickup_class.draw_at(raster.surface, view, x * CELL_SIZE + CELL_SIZE // 2, y * CELL_SIZE + CELL_SIZE // 2)
+
+        self.rasters[zoom] = raster
+        return raster
+
@@ -0,0 +1,79 @@
+from collections import namedtuple
+
+
+# Where the camera was at the end of a tick, and what it could see
+CameraState = namedtuple('CameraState',
+                         'camera_x camera_y zoom target_zoom viewport_width viewport_height render_scale')
+# The level as the renderer sees it: read-only copies of its grids, taken
+# when it starts, and its heading. Coins and diamonds start on every ' '
+# and 'D' cell of `maze`.
+StaticWorld = namedtuple('StaticWorld', 'number title width height maze terrain')
+# Cells whose pickup was collected, one link per tick that collected any;
+# each snapshot points at the newest link, so a renderer that skipped some
+# ticks can still walk back to the last one it applied
+TakenCells = namedtuple('TakenCells', 'cells previous')
+WorldSnapshot = namedtuple('WorldSnapshot',
+                           'tick camera world taken score state countdown player enemies particles star')
+
+# A camera state plus the sprite cache: all the draw functions read from
+# their `game` argument, so a frame can be drawn without touching the game
+RenderCamera = namedtuple('RenderCamera', CameraState._fields + ('sprite_cache',))
+
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+
+def lerp_actor(previous, current, t):
+    """Actor states carry an id, so a replaced actor is never slid from the old one"""
+    if previous.id != current.id:
+        return current
+    return current._replace(x=lerp(previous.x, current.x, t), y=lerp(previous.y, current.y, t))
+
+
+def lerp_camera(previous, current, t):
+    return current._replace(camera_x=lerp(previous.camera_x, current.camera_x, t),
+                            camera_y=lerp(previous.camera_y, current.camera_y, t),
+                            zoom=lerp(previous.zoom, current.zoom, t),
+                            viewport_width=lerp(previous.viewport_width, current.viewport_width, t),
+                            viewport_height=lerp(previous.viewport_height, current.viewport_height, t))
+
+
+class SnapshotBuffer:
+    """The last two states the simulation published, for the renderer.
+
+    Each tick ends with publish(), which copies the camera, the score and
+    state, the pickups collected so far and everything drawn about the
+    actors into an immutable WorldSnapshot. view(t) blends the previous and
+    current snapshots, so drawing never extrapolates and never reads an
+    object halfway through its update. Both are swapped in with one
+    assignment, which keeps them consistent for a reader on another thread
+    too.
+    """
+    def __init__(self):
+        self.tick = 0
+        self.pair = (None, None)
+
+    def reset(self):
+        """Forget the last state, so a new level does not slide in from the old one"""
+        self.pair = (None, None)
+
+    def publish(self, camera, world, taken, score, state, countdown, player, enemies, particles, star):
+        self.tick += 1
+        snapshot = WorldSnapshot(self.tick, camera, world, taken, score, state, countdown, player.state(),
+                                 tuple(enemy.state() for enemy in enemies),
+                                 tuple(particles), star.state() if star else None)
+        self.pair = (self.pair[1] or snapshot, snapshot)
+
+    def view(self, t):
+        """State t of the way from the previous snapshot to the current one"""
+        previous, current = self.pair
+        if current is None or previous is current or t >= 1:
+            return current
+        # Enemies are paired by id, so one spawning or leaving does not shift the rest
+        before = {enemy.id: enemy for enemy in previous.enemies}
+        enemies = tuple(lerp_actor(before[enemy.id], enemy, t) if enemy.id in before else enemy
+                        for enemy in current.enemies)
+        return current._replace(camera=lerp_camera(previous.camera, current.camera, t),
+                                player=lerp_actor(previous.player, current.player, t),
+                                enemies=enemies)